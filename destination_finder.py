@@ -4,6 +4,8 @@ Module to find destinations where both people can meet
 from typing import List, Dict, Optional, Set
 from flight_search import FlightSearch, format_airport_code, resolve_airport_code
 import logging
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -84,8 +86,18 @@ def is_valid_airport(airport_code: str) -> bool:
 class DestinationFinder:
     """Finds suitable destinations where both people can meet"""
     
-    def __init__(self, flight_search: FlightSearch):
+    def __init__(self, flight_search: FlightSearch, max_parallel_destinations: int = 1):
+        """
+        Initialize destination finder
+        
+        Args:
+            flight_search: FlightSearch instance used for all API calls
+            max_parallel_destinations: How many destinations are searched at the same time
+                (default 1 = one after another; each one runs 2 flight searches in parallel,
+                so raising this multiplies concurrent API calls and can hit rate limits)
+        """
         self.flight_search = flight_search
+        self.max_parallel_destinations = max(1, max_parallel_destinations)
     
     def find_meeting_destinations(
         self,
@@ -259,109 +271,134 @@ class DestinationFinder:
                 logger.info(f"   No limit set - checking all destinations (this may take longer)")
                 logger.info(f"")
         
-        all_matches = []
+        # Matches are deduplicated as each destination's results arrive - the same
+        # flight pair might appear multiple times - so no second list of all
+        # matches is built
+        unique_matches = []
+        seen_pairs = set()
+        total_matches = 0
         destinations_with_matches = 0
         
-        for i, destination in enumerate(destinations_to_check, 1):
+        def search_destination(i: int, destination: str) -> List[Dict]:
+            """Search matching flights for one destination"""
             logger.info(f"")
             logger.info(f"[{i}/{len(destinations_to_check)}] Processing destination: {format_airport_code(destination)}")
             logger.info(f"{'='*80}")
-            
-            try:
-                matches = self.flight_search.find_matching_flights(
-                    origin1=origin1,
-                    origin2=origin2,
-                    destination=destination,
-                    departure_date=departure_date,
-                    return_date=return_date,
-                    max_price=max_price,
-                    max_stops_person1=max_stops_person1,
-                    max_stops_person2=max_stops_person2,
-                    arrival_tolerance_hours=arrival_tolerance_hours,
-                    min_departure_time_outbound=min_departure_time_outbound,
-                    min_departure_time_return=min_departure_time_return,
-                    nearby_airports_radius_km=nearby_airports_radius_km,
-                    return_airport_radius_km=return_airport_radius_km,
-                    max_duration_hours_person1=max_flight_duration_hours_person1,
-                    max_duration_hours_person2=max_flight_duration_hours_person2,
-                    flight_type=flight_type
-                )
-                
-                if matches:
-                    destinations_with_matches += 1
-                    logger.info(f"   ✓ {format_airport_code(destination)}: Found {len(matches)} matching flight pair(s)")
-                    all_matches.extend(matches)
-                else:
-                    logger.info(f"   ✗ {format_airport_code(destination)}: No matching flights found")
-                    
-            except Exception as e:
-                logger.error(f"   ❌ Error while searching destination {format_airport_code(destination)}: {e}")
-                logger.error(f"      Continuing with next destination...")
-                continue
-        
-        # Deduplicate matches - same flight pair might appear multiple times
-        # Create a unique key for each flight pair based on flight details
-        seen_pairs = set()
-        deduplicated_matches = []
+            return self.flight_search.find_matching_flights(
+                origin1=origin1,
+                origin2=origin2,
+                destination=destination,
+                departure_date=departure_date,
+                return_date=return_date,
+                max_price=max_price,
+                max_stops_person1=max_stops_person1,
+                max_stops_person2=max_stops_person2,
+                arrival_tolerance_hours=arrival_tolerance_hours,
+                min_departure_time_outbound=min_departure_time_outbound,
+                min_departure_time_return=min_departure_time_return,
+                nearby_airports_radius_km=nearby_airports_radius_km,
+                return_airport_radius_km=return_airport_radius_km,
+                max_duration_hours_person1=max_flight_duration_hours_person1,
+                max_duration_hours_person2=max_flight_duration_hours_person2,
+                flight_type=flight_type
+            )
         
-        for match in all_matches:
-            # Create a unique identifier for this flight pair
-            p1_flight = match.get('person1_flight', {})
-            p2_flight = match.get('person2_flight', {})
+        # Search several destinations in parallel - the work is waiting on the API, so
+        # wall time approaches the slowest searches instead of the sum of all of them.
+        # Results are collected in destination order so the output stays deterministic.
+        with ThreadPoolExecutor(max_workers=self.max_parallel_destinations) as executor:
+            futures = [
+                (destination, executor.submit(search_destination, i, destination))
+                for i, destination in enumerate(destinations_to_check, 1)
+            ]
             
-            # Extract key identifiers from flights
-            # Use first segment departure/arrival times and airlines as unique key
-            try:
-                p1_outbound = p1_flight.get('itineraries', [{}])[0]
-                p1_outbound_segments = p1_outbound.get('segments', [])
-                p1_outbound_dep = p1_outbound_segments[0].get('departure', {}).get('at', '') if p1_outbound_segments else ''
-                p1_outbound_arr = p1_outbound_segments[-1].get('arrival', {}).get('at', '') if p1_outbound_segments else ''
-                p1_airlines = ','.join(sorted(set(seg.get('carrierCode', '') for seg in p1_outbound_segments)))
-                
-                p2_outbound = p2_flight.get('itineraries', [{}])[0]
-                p2_outbound_segments = p2_outbound.get('segments', [])
-                p2_outbound_dep = p2_outbound_segments[0].get('departure', {}).get('at', '') if p2_outbound_segments else ''
-                p2_outbound_arr = p2_outbound_segments[-1].get('arrival', {}).get('at', '') if p2_outbound_segments else ''
-                p2_airlines = ','.join(sorted(set(seg.get('carrierCode', '') for seg in p2_outbound_segments)))
-                
-                # Create unique key: destination + both flights' key details
-                unique_key = (
-                    match.get('destination', ''),
-                    p1_outbound_dep,
-                    p1_outbound_arr,
-                    p1_airlines,
-                    p2_outbound_dep,
-                    p2_outbound_arr,
-                    p2_airlines,
-                    match.get('person1_price', 0),
-                    match.get('person2_price', 0)
-                )
-                
-                if unique_key not in seen_pairs:
-                    seen_pairs.add(unique_key)
-                    deduplicated_matches.append(match)
-                else:
-                    logger.debug(f"   Skipping duplicate flight pair: {match.get('destination')} - Person 1: {p1_outbound_dep}, Person 2: {p2_outbound_dep}")
-            except Exception as e:
-                # If we can't create a unique key, include the match anyway (fail open)
-                logger.debug(f"   Error creating unique key for match: {e}, including anyway")
-                deduplicated_matches.append(match)
+            for destination, future in futures:
+                try:
+                    matches = future.result()
+                    
+                    if matches:
+                        destinations_with_matches += 1
+                        logger.info(f"   ✓ {format_airport_code(destination)}: Found {len(matches)} matching flight pair(s)")
+                        total_matches += len(matches)
+                        for match in matches:
+                            try:
+                                unique_key = self._flight_pair_key(match)
+                            except Exception as e:
+                                # If we can't create a unique key, include the match anyway (fail open)
+                                logger.debug(f"   Error creating unique key for match: {e}, including anyway")
+                                unique_matches.append(match)
+                                continue
+                            
+                            if unique_key not in seen_pairs:
+                                seen_pairs.add(unique_key)
+                                unique_matches.append(match)
+                            else:
+                                logger.debug(f"   Skipping duplicate flight pair: {match.get('destination')} - Person 1: {unique_key[1]}, Person 2: {unique_key[4]}")
+                    else:
+                        logger.info(f"   ✗ {format_airport_code(destination)}: No matching flights found")
+                        
+                except Exception as e:
+                    logger.error(f"   ❌ Error while searching destination {format_airport_code(destination)}: {e}")
+                    logger.error(f"      Continuing with next destination...")
+                    continue
         
-        duplicates_removed = len(all_matches) - len(deduplicated_matches)
+        duplicates_removed = total_matches - len(unique_matches)
         if duplicates_removed > 0:
             logger.info(f"   Removed {duplicates_removed} duplicate flight pair(s)")
         
         # Sort all matches by total price
-        deduplicated_matches.sort(key=lambda x: x['total_price'])
+        unique_matches.sort(key=itemgetter('total_price'))
         
         logger.info(f"")
         logger.info(f"📊 Search Summary:")
         logger.info(f"   Destinations checked: {len(destinations_to_check)}")
         logger.info(f"   Destinations with matches: {destinations_with_matches}")
-        logger.info(f"   Total matching flight pairs found: {len(all_matches)}")
+        logger.info(f"   Total matching flight pairs found: {total_matches}")
         if duplicates_removed > 0:
             logger.info(f"   Duplicates removed: {duplicates_removed}")
-        logger.info(f"   Unique flight pairs: {len(deduplicated_matches)}")
+        logger.info(f"   Unique flight pairs: {len(unique_matches)}")
         
-        return deduplicated_matches
-
+        return unique_matches
+    
+    @staticmethod
+    def _flight_pair_key(match: Dict) -> tuple:
+        """
+        Build the key that identifies a flight pair for deduplication
+        
+        Uses the destination, both outbound first-departure/last-arrival times,
+        airlines and both prices.
+        
+        Args:
+            match: Match dictionary from FlightSearch.find_matching_flights
+        
+        Returns:
+            Tuple of (destination, p1 departure, p1 arrival, p1 airlines,
+            p2 departure, p2 arrival, p2 airlines, p1 price, p2 price)
+        """
+        p1_flight = match.get('person1_flight', {})
+        p2_flight = match.get('person2_flight', {})
+        
+        # Use first segment departure/arrival times and airlines as unique key
+        p1_outbound = p1_flight.get('itineraries', [{}])[0]
+        p1_outbound_segments = p1_outbound.get('segments', [])
+        p1_outbound_dep = p1_outbound_segments[0].get('departure', {}).get('at', '') if p1_outbound_segments else ''
+        p1_outbound_arr = p1_outbound_segments[-1].get('arrival', {}).get('at', '') if p1_outbound_segments else ''
+        p1_airlines = ','.join(sorted(set(seg.get('carrierCode', '') for seg in p1_outbound_segments)))
+        
+        p2_outbound = p2_flight.get('itineraries', [{}])[0]
+        p2_outbound_segments = p2_outbound.get('segments', [])
+        p2_outbound_dep = p2_outbound_segments[0].get('departure', {}).get('at', '') if p2_outbound_segments else ''
+        p2_outbound_arr = p2_outbound_segments[-1].get('arrival', {}).get('at', '') if p2_outbound_segments else ''
+        p2_airlines = ','.join(sorted(set(seg.get('carrierCode', '') for seg in p2_outbound_segments)))
+        
+        return (
+            match.get('destination', ''),
+            p1_outbound_dep,
+            p1_outbound_arr,
+            p1_airlines,
+            p2_outbound_dep,
+            p2_outbound_arr,
+            p2_airlines,
+            match.get('person1_price', 0),
+            match.get('person2_price', 0)
+        )
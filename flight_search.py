@@ -7,11 +7,110 @@ from amadeus import Client, ResponseError
 import logging
 import json
 import os
+import http.client
+import io
+import threading
+import urllib.error
+import urllib.request
+import urllib.response
+from urllib.parse import urlsplit
+from bisect import bisect_left, bisect_right
 from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
+
+# orjson is optional - it parses and serializes the JSON cache files several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+def _read_json_file(path: str):
+    """Read a JSON file, using orjson when it is installed"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_json_file(path: str, data) -> None:
+    """Write data to a JSON file (indented, UTF-8), using orjson when it is installed"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+class _KeepAliveOpener:
+    """
+    urlopen-compatible HTTP handler for the Amadeus client that reuses connections
+    
+    The SDK's default handler (urllib's urlopen) opens a new TCP + TLS connection for
+    every API call. This keeps a pool of idle HTTPS connections per host, shared by all
+    threads: a call checks a connection out (http.client connections aren't thread-safe,
+    so each is used by one call at a time) and returns it when the response is read.
+    Searches running on short-lived worker threads therefore still skip the handshake.
+    """
+    
+    def __init__(self, timeout: Optional[float] = None):
+        self.timeout = timeout
+        self._idle: Dict[Tuple[str, str], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+    
+    def _acquire(self, scheme: str, host: str, fresh: bool = False) -> http.client.HTTPConnection:
+        """Take an idle connection to a host from the pool, or open a new one"""
+        if not fresh:
+            with self._lock:
+                idle = self._idle.get((scheme, host))
+                if idle:
+                    return idle.pop()
+        conn_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return conn_class(host, timeout=self.timeout)
+    
+    def _release(self, scheme: str, host: str, conn: http.client.HTTPConnection):
+        """Return a connection to the pool so the next call (from any thread) can reuse it"""
+        with self._lock:
+            self._idle.setdefault((scheme, host), []).append(conn)
+    
+    def __call__(self, request: urllib.request.Request):
+        """Send a urllib Request and return a fully read, urlopen-style response"""
+        # Respect proxy settings, which http.client doesn't handle by itself
+        if urllib.request.getproxies():
+            return urllib.request.urlopen(request)
+        
+        url = urlsplit(request.full_url)
+        path = url.path + (f"?{url.query}" if url.query else "")
+        headers = dict(request.header_items())
+        
+        # A kept-alive connection may have been closed by the server - retry once on a fresh one
+        for attempt in range(2):
+            conn = self._acquire(url.scheme, url.netloc, fresh=attempt > 0)
+            try:
+                conn.request(request.get_method(), path, body=request.data, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+                break
+            except (http.client.HTTPException, OSError) as e:
+                conn.close()
+                if attempt == 1:
+                    # The SDK reports URLError as a network error
+                    raise urllib.error.URLError(e)
+        
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(url.scheme, url.netloc, conn)
+        
+        return urllib.response.addinfourl(io.BytesIO(body), response.msg, request.full_url, response.status)
+
+
 # Airport code to city name mapping - loaded from external file
 _AIRPORT_NAMES = None
 
@@ -51,8 +150,9 @@ def _load_airport_names():
     return _AIRPORT_NAMES
 
 
+@lru_cache(maxsize=4096)
 def format_airport_code(code: str) -> str:
-    """Format airport code with city name in brackets if known"""
+    """Format airport code with city name in brackets if known (memoized - the mapping is static)"""
     airport_names = _load_airport_names()
     code_upper = code.upper()
     city_name = airport_names.get(code_upper)
@@ -93,11 +193,14 @@ def _load_airport_aliases():
     return _AIRPORT_ALIASES
 
 
+@lru_cache(maxsize=4096)
 def resolve_airport_code(code: str) -> str:
     """
     Resolve airport code - if it's a non-airport code (like railway station),
     return the nearest airport code from the aliases mapping.
     
+    Results are memoized since the aliases mapping is static for the process lifetime.
+    
     Args:
         code: Airport code or non-airport code (e.g., XTI for railway station)
     
@@ -146,10 +249,12 @@ class FlightSearch:
             logger.warning(f"Unknown environment '{environment}', defaulting to test")
             hostname = "test"
         
+        # Reuse HTTPS connections across API calls instead of reconnecting for each one
         self.amadeus = Client(
             client_id=api_key,
             client_secret=api_secret,
-            hostname=hostname
+            hostname=hostname,
+            http=_KeepAliveOpener()
         )
         
         # Store environment for later checks
@@ -158,6 +263,10 @@ class FlightSearch:
         self.cache_expiration_days = cache_expiration_days
         self.use_flight_cache = use_flight_cache
         
+        # In-memory cache of search_flights results, keyed by all search arguments
+        # Each entry stores the date it was made, following the same-day rule as the file cache
+        self._search_cache: Dict[tuple, Tuple[str, List[Dict]]] = {}
+        
         # Verify credentials are set
         if not api_key or not api_secret:
             raise ValueError("Amadeus API key and secret must be provided")
@@ -412,6 +521,20 @@ class FlightSearch:
         origin = origin_resolved
         destination = destination_resolved
         
+        # Repeated searches with the same arguments are answered from memory
+        # (only the date the search actually uses is part of the key for one-way flights)
+        search_key = (
+            origin, destination,
+            None if is_return_only else departure_date,
+            return_date if (is_round_trip or is_return_only) else None,
+            max_stops, min_departure_time_outbound, min_departure_time_return,
+            nearby_airports_radius_km, return_airport_radius_km, max_duration_hours, flight_type
+        )
+        memoized_flights = self._get_memoized_search(search_key)
+        if memoized_flights is not None:
+            logger.debug(f"  → Using in-memory results for {format_airport_code(origin)} → {format_airport_code(destination)} ({len(memoized_flights)} flight(s))")
+            return memoized_flights
+        
         # Special handling for round-trip flights with return_airport_radius_km > 0
         # In this case, we need to search outbound and return separately and combine them
         if is_round_trip and return_airport_radius_km > 0:
@@ -450,9 +573,17 @@ class FlightSearch:
                 return []
             
             # Combine outbound and return flights into round-trip flight objects
+            # Prices are parsed once per flight rather than once per outbound/return pair
+            return_options = [
+                (return_flight, return_flight.get('itineraries', [{}])[0], self._price_parts(return_flight))
+                for return_flight in all_return_flights
+            ]
             combined_flights = []
             for outbound in outbound_flights:
-                for return_flight in all_return_flights:
+                outbound_itinerary = outbound.get('itineraries', [{}])[0]
+                out_currency, out_total, out_base, out_grand_total, out_fees = self._price_parts(outbound)
+                for return_flight, return_itinerary, return_price in return_options:
+                    _, ret_total, ret_base, ret_grand_total, ret_fees = return_price
                     # Create a combined round-trip flight object
                     combined_flight = {
                         'type': 'flight-offer',
@@ -467,18 +598,15 @@ class FlightSearch:
                             return_flight.get('numberOfBookableSeats', 9)
                         ),
                         'itineraries': [
-                            outbound.get('itineraries', [{}])[0],  # Outbound itinerary
-                            return_flight.get('itineraries', [{}])[0]  # Return itinerary
+                            outbound_itinerary,  # Outbound itinerary
+                            return_itinerary  # Return itinerary
                         ],
                         'price': {
-                            'currency': outbound.get('price', {}).get('currency', 'EUR'),
-                            'total': str(float(outbound.get('price', {}).get('total', '0')) + float(return_flight.get('price', {}).get('total', '0'))),
-                            'base': str(float(outbound.get('price', {}).get('base', '0')) + float(return_flight.get('price', {}).get('base', '0'))),
-                            'fees': [
-                                *outbound.get('price', {}).get('fees', []),
-                                *return_flight.get('price', {}).get('fees', [])
-                            ],
-                            'grandTotal': str(float(outbound.get('price', {}).get('grandTotal', '0')) + float(return_flight.get('price', {}).get('grandTotal', '0')))
+                            'currency': out_currency,
+                            'total': str(out_total + ret_total),
+                            'base': str(out_base + ret_base),
+                            'fees': [*out_fees, *ret_fees],
+                            'grandTotal': str(out_grand_total + ret_grand_total)
                         },
                         'pricingOptions': outbound.get('pricingOptions', {}),
                         'validatingAirlineCodes': list(set(
@@ -517,11 +645,14 @@ class FlightSearch:
                 nearby_airports_radius_km=nearby_airports_radius_km,
                 return_airport_radius_km=return_airport_radius_km,
                 max_duration_hours=max_duration_hours,
-                flight_type=flight_type
+                flight_type=flight_type,
+                min_departure_time_outbound=min_departure_time_outbound,
+                min_departure_time_return=min_departure_time_return
             )
             
             if cached_flights is not None:
                 # Return cached results (they're already filtered)
+                self._memoize_search(search_key, cached_flights)
                 return cached_flights
             
             # Get nearby airports if radius is specified
@@ -563,7 +694,11 @@ class FlightSearch:
                     all_flights.extend(flights)
                     
                 except ResponseError as error:
-                    logger.debug(f"  → API error for {format_airport_code(airport_origin)} → {format_airport_code(search_destination)}: {error}")
+                    if getattr(getattr(error, 'response', None), 'status_code', None) == 429:
+                        # Throttled - the route looks like it has no flights, so say so loudly
+                        logger.warning(f"  ⚠️  Amadeus API rate limit reached (HTTP 429) for {format_airport_code(airport_origin)} → {format_airport_code(search_destination)} - flights for this route are missing; lower max_parallel_destinations")
+                    else:
+                        logger.debug(f"  → API error for {format_airport_code(airport_origin)} → {format_airport_code(search_destination)}: {error}")
                     continue
                 except Exception as e:
                     logger.debug(f"  → Error searching {format_airport_code(airport_origin)} → {format_airport_code(search_destination)}: {e}")
@@ -640,9 +775,12 @@ class FlightSearch:
                     return_airport_radius_km=return_airport_radius_km,
                     max_duration_hours=max_duration_hours,
                     flights=flights,
-                    flight_type=flight_type
+                    flight_type=flight_type,
+                    min_departure_time_outbound=min_departure_time_outbound,
+                    min_departure_time_return=min_departure_time_return
                 )
             
+            self._memoize_search(search_key, flights)
             return flights
             
         except ResponseError as error:
@@ -676,6 +814,40 @@ class FlightSearch:
             logger.error(f"     This is a local error (not from Amadeus API)")
             return []
     
+    def _get_memoized_search(self, search_key: tuple) -> Optional[List[Dict]]:
+        """
+        Get search_flights results remembered earlier in this process
+        
+        Args:
+            search_key: Tuple of all search arguments
+        
+        Returns:
+            Copy of the remembered flight list if it was stored today, None otherwise
+        """
+        if not self.use_flight_cache:
+            return None
+        entry = self._search_cache.get(search_key)
+        if entry is None:
+            return None
+        
+        cached_date, flights = entry
+        if cached_date != datetime.now().date().isoformat():
+            # Same rule as the file cache - results are only reused on the day they were fetched
+            self._search_cache.pop(search_key, None)
+            return None
+        return list(flights)
+    
+    def _memoize_search(self, search_key: tuple, flights: List[Dict]):
+        """
+        Remember search_flights results for the rest of the process
+        
+        Args:
+            search_key: Tuple of all search arguments
+            flights: Filtered flight offers returned for these arguments
+        """
+        if self.use_flight_cache:
+            self._search_cache[search_key] = (datetime.now().date().isoformat(), list(flights))
+    
     def _is_direct_flight(self, flight_offer: Dict) -> bool:
         """Check if flight is direct (no stops)
         
@@ -742,7 +914,7 @@ class FlightSearch:
                     
                     if dep_time:
                         min_hour, min_minute = map(int, min_time_outbound.split(':'))
-                        dep_datetime = datetime.fromisoformat(dep_time.replace('Z', '+00:00'))
+                        dep_datetime = datetime.fromisoformat(dep_time)
                         if not (dep_datetime.hour > min_hour or (dep_datetime.hour == min_hour and dep_datetime.minute >= min_minute)):
                             valid = False
                             logger.debug(f"      Outbound departure {dep_time} is before {min_time_outbound}")
@@ -757,7 +929,7 @@ class FlightSearch:
                     
                     if dep_time:
                         min_hour, min_minute = map(int, min_time_return.split(':'))
-                        dep_datetime = datetime.fromisoformat(dep_time.replace('Z', '+00:00'))
+                        dep_datetime = datetime.fromisoformat(dep_time)
                         if not (dep_datetime.hour > min_hour or (dep_datetime.hour == min_hour and dep_datetime.minute >= min_minute)):
                             valid = False
                             logger.debug(f"      Return departure FROM destination {dep_time} is before {min_time_return}")
@@ -785,7 +957,7 @@ class FlightSearch:
                 arr_time = last_segment.get('arrival', {}).get('at', '')
                 
                 if arr_time:
-                    arr_datetime = datetime.fromisoformat(arr_time.replace('Z', '+00:00'))
+                    arr_datetime = datetime.fromisoformat(arr_time)
                     if not (arr_datetime.hour > min_hour or (arr_datetime.hour == min_hour and arr_datetime.minute >= min_minute)):
                         valid = False
                         logger.debug(f"      Outbound arrival {arr_time} is before {min_time}")
@@ -798,7 +970,7 @@ class FlightSearch:
                     arr_time = last_segment.get('arrival', {}).get('at', '')
                     
                     if arr_time:
-                        arr_datetime = datetime.fromisoformat(arr_time.replace('Z', '+00:00'))
+                        arr_datetime = datetime.fromisoformat(arr_time)
                         if not (arr_datetime.hour > min_hour or (arr_datetime.hour == min_hour and arr_datetime.minute >= min_minute)):
                             valid = False
                             logger.debug(f"      Return arrival {arr_time} is before {min_time}")
@@ -870,8 +1042,7 @@ class FlightSearch:
             return None
         
         try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
+            cache_data = _read_json_file(cache_file)
             
             # Check if cache is still valid
             cached_date = datetime.fromisoformat(cache_data.get('cached_date', ''))
@@ -922,8 +1093,7 @@ class FlightSearch:
                 'count': len(unique_destinations)
             }
             
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2, ensure_ascii=False)
+            _write_json_file(cache_file, cache_data)
             
             if len(unique_destinations) < len(destinations):
                 logger.debug(f"   Deduplicated {len(destinations)} → {len(unique_destinations)} destinations before caching")
@@ -931,6 +1101,60 @@ class FlightSearch:
         except Exception as e:
             logger.debug(f"   Error saving cache for {format_airport_code(origin)}: {e}")
     
+    @staticmethod
+    def _flight_cache_file(
+        origin: str,
+        destination: str,
+        departure_date: str,
+        return_date: Optional[str],
+        max_stops: int,
+        nearby_airports_radius_km: int,
+        return_airport_radius_km: int,
+        max_duration_hours: float,
+        flight_type: str,
+        min_departure_time_outbound: Optional[str],
+        min_departure_time_return: Optional[str]
+    ) -> str:
+        """
+        Get the cache file path for a flight search
+        
+        The key is built from normalized search parameters, so equivalent searches share
+        a cache entry (e.g. "tlv" and "TLV", or max duration 6 and 6.0), and includes the
+        departure time filters, since cached results have already been filtered by them.
+        Only the time filter that applies to the flight type is part of the key.
+        
+        Returns:
+            Path of the JSON cache file (the cache directory is created if needed)
+        """
+        if flight_type == "outbound":
+            min_departure_time_return = None
+        elif flight_type == "return":
+            min_departure_time_outbound = None
+        
+        key_parts = [
+            origin.upper(),
+            destination.upper(),
+            departure_date,
+            return_date or "none",
+            str(int(max_stops)),
+            f"{float(nearby_airports_radius_km):g}",
+            f"{float(return_airport_radius_km):g}",
+            f"{float(max_duration_hours):g}",
+            flight_type
+        ]
+        # Time filters are only appended when set, keeping keys short for unfiltered searches
+        if min_departure_time_outbound or min_departure_time_return:
+            key_parts.append(f"out{min_departure_time_outbound or 'any'}")
+            key_parts.append(f"ret{min_departure_time_return or 'any'}")
+        
+        # Sanitize cache key for filename (replace invalid characters)
+        cache_key_safe = "_".join(key_parts).replace('/', '_').replace(':', '')
+        
+        cache_dir = os.path.join(os.path.dirname(__file__), 'data', 'flights_cache')
+        os.makedirs(cache_dir, exist_ok=True)
+        
+        return os.path.join(cache_dir, f"{cache_key_safe}.json")
+    
     def _get_cached_flights(
         self,
         origin: str,
@@ -941,7 +1165,9 @@ class FlightSearch:
         nearby_airports_radius_km: int,
         return_airport_radius_km: int,
         max_duration_hours: float,
-        flight_type: str = "both"
+        flight_type: str = "both",
+        min_departure_time_outbound: Optional[str] = None,
+        min_departure_time_return: Optional[str] = None
     ) -> Optional[List[Dict]]:
         """
         Get cached flight search results
@@ -955,6 +1181,9 @@ class FlightSearch:
             nearby_airports_radius_km: Search radius for nearby airports
             return_airport_radius_km: Return flight airport radius (km)
             max_duration_hours: Maximum flight duration in hours
+            flight_type: Flight type ("both", "outbound", or "return")
+            min_departure_time_outbound: Minimum outbound departure time the results were filtered by (HH:MM)
+            min_departure_time_return: Minimum return departure time the results were filtered by (HH:MM)
         
         Returns:
             List of cached flight offers if cache exists and is valid, None otherwise
@@ -963,26 +1192,18 @@ class FlightSearch:
             logger.debug(f"   Flight caching is disabled (use_flight_cache=False)")
             return None
         
-        # Create cache key from all search parameters
-        # This ensures we cache correctly based on all search criteria
-        return_date_str = return_date if return_date else "none"
-        cache_key = f"{origin.upper()}_{destination.upper()}_{departure_date}_{return_date_str}_{max_stops}_{nearby_airports_radius_km}_{return_airport_radius_km}_{max_duration_hours}_{flight_type}"
-        
-        # Sanitize cache key for filename (replace invalid characters)
-        cache_key_safe = cache_key.replace('/', '_').replace(':', '_')
-        
-        cache_dir = os.path.join(os.path.dirname(__file__), 'data', 'flights_cache')
-        os.makedirs(cache_dir, exist_ok=True)
-        
-        cache_file = os.path.join(cache_dir, f"{cache_key_safe}.json")
+        cache_file = self._flight_cache_file(
+            origin, destination, departure_date, return_date, max_stops,
+            nearby_airports_radius_km, return_airport_radius_km, max_duration_hours, flight_type,
+            min_departure_time_outbound, min_departure_time_return
+        )
         
         if not os.path.exists(cache_file):
             logger.debug(f"   Cache file not found for {format_airport_code(origin)} → {format_airport_code(destination)} ({departure_date} to {return_date})")
             return None
         
         try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
+            cache_data = _read_json_file(cache_file)
             
             # Verify cache parameters match (safety check - cache key should already ensure this)
             cached_origin = cache_data.get('origin', '').upper()
@@ -1044,7 +1265,9 @@ class FlightSearch:
         return_airport_radius_km: int,
         max_duration_hours: float,
         flights: List[Dict],
-        flight_type: str = "both"
+        flight_type: str = "both",
+        min_departure_time_outbound: Optional[str] = None,
+        min_departure_time_return: Optional[str] = None
     ):
         """
         Save flight search results to cache
@@ -1060,22 +1283,18 @@ class FlightSearch:
             max_duration_hours: Maximum flight duration in hours
             flights: List of flight offers to cache
             flight_type: Flight type ("both", "outbound", or "return")
+            min_departure_time_outbound: Minimum outbound departure time the flights were filtered by (HH:MM)
+            min_departure_time_return: Minimum return departure time the flights were filtered by (HH:MM)
         """
         if not self.use_flight_cache:
             logger.debug(f"   Flight caching is disabled (use_flight_cache=False)")
             return
         
-        # Create cache key from all search parameters
-        return_date_str = return_date if return_date else "none"
-        cache_key = f"{origin.upper()}_{destination.upper()}_{departure_date}_{return_date_str}_{max_stops}_{nearby_airports_radius_km}_{return_airport_radius_km}_{max_duration_hours}_{flight_type}"
-        
-        # Sanitize cache key for filename
-        cache_key_safe = cache_key.replace('/', '_').replace(':', '_')
-        
-        cache_dir = os.path.join(os.path.dirname(__file__), 'data', 'flights_cache')
-        os.makedirs(cache_dir, exist_ok=True)
-        
-        cache_file = os.path.join(cache_dir, f"{cache_key_safe}.json")
+        cache_file = self._flight_cache_file(
+            origin, destination, departure_date, return_date, max_stops,
+            nearby_airports_radius_km, return_airport_radius_km, max_duration_hours, flight_type,
+            min_departure_time_outbound, min_departure_time_return
+        )
         
         try:
             cache_data = {
@@ -1093,8 +1312,7 @@ class FlightSearch:
                 'count': len(flights)
             }
             
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2, ensure_ascii=False)
+            _write_json_file(cache_file, cache_data)
             
             logger.debug(f"   Cached {len(flights)} flight(s) for {format_airport_code(origin)} → {format_airport_code(destination)} ({departure_date} to {return_date}) to {cache_file}")
         except Exception as e:
@@ -1825,7 +2043,7 @@ class FlightSearch:
         dest2_set = set(dest.upper() for dest in dest2)
         
         # Both origins returned results - find intersection
-        common = sorted(list(dest1_set.intersection(dest2_set)))
+        common = sorted(dest1_set & dest2_set)
         logger.info(f"   Common destinations (intersection): {len(common)}")
         
         if common:
@@ -1835,7 +2053,7 @@ class FlightSearch:
             logger.warning(f"   ⚠️  No common destinations found in intersection!")
             logger.warning(f"   This may indicate test environment limitations or incomplete Inspiration Search data")
             logger.info(f"   Using union of both lists as fallback...")
-            common = sorted(list(dest1_set.union(dest2_set)))
+            common = sorted(dest1_set | dest2_set)
             logger.info(f"   Using all destinations from both origins: {len(common)} unique")
             logger.info(f"   Note: Flight Offers Search will validate which destinations are actually reachable")
         
@@ -1911,11 +2129,11 @@ class FlightSearch:
         logger.info(f"   Person 2: {format_airport_code(origin2_resolved)} → {format_airport_code(destination_resolved)}")
         
         # Search flights for both persons in parallel
-        logger.debug(f"   Searching flights for Person 1 and Person 2 in parallel...")
+        logger.debug("   Searching flights for Person 1 and Person 2 in parallel...")
         
         def search_person1():
             """Search flights for person 1"""
-            logger.debug(f"   [Thread] Searching flights for Person 1 ({format_airport_code(origin1_resolved)} → {format_airport_code(destination_resolved)})...")
+            logger.debug("   [Thread] Searching flights for Person 1 (%s → %s)...", format_airport_code(origin1_resolved), format_airport_code(destination_resolved))
             return self.search_flights(
                 origin1_resolved, destination_resolved, departure_date, return_date,
                 max_stops_person1, min_departure_time_outbound, min_departure_time_return,
@@ -1924,7 +2142,7 @@ class FlightSearch:
         
         def search_person2():
             """Search flights for person 2"""
-            logger.debug(f"   [Thread] Searching flights for Person 2 ({format_airport_code(origin2_resolved)} → {format_airport_code(destination_resolved)})...")
+            logger.debug("   [Thread] Searching flights for Person 2 (%s → %s)...", format_airport_code(origin2_resolved), format_airport_code(destination_resolved))
             return self.search_flights(
                 origin2_resolved, destination_resolved, departure_date, return_date,
                 max_stops_person2, min_departure_time_outbound, min_departure_time_return,
@@ -1943,91 +2161,94 @@ class FlightSearch:
             # Wait for both to complete and collect results
             try:
                 flights1 = future1.result()
-                logger.debug(f"   [Thread] Person 1 search completed: {len(flights1)} flight(s)")
+                logger.debug("   [Thread] Person 1 search completed: %d flight(s)", len(flights1))
             except Exception as e:
                 logger.error(f"   ❌ Error searching flights for Person 1: {e}")
                 flights1 = []
             
             try:
                 flights2 = future2.result()
-                logger.debug(f"   [Thread] Person 2 search completed: {len(flights2)} flight(s)")
+                logger.debug("   [Thread] Person 2 search completed: %d flight(s)", len(flights2))
             except Exception as e:
                 logger.error(f"   ❌ Error searching flights for Person 2: {e}")
                 flights2 = []
         
         logger.info(f"   Found {len(flights1)} flight(s) for Person 1, {len(flights2)} flight(s) for Person 2")
         
-        matching_pairs = []
-        price_filtered_count = 0
-        time_filtered_count = 0
-        
-        logger.debug(f"   Comparing {len(flights1)} × {len(flights2)} = {len(flights1) * len(flights2)} possible flight combinations...")
-        
-        for f1 in flights1:
-            # Get price and currency
-            price_info1 = f1.get('price', {})
-            price1 = float(price_info1.get('total', 0))
-            currency1 = price_info1.get('currency', 'EUR')
-            
-            # Check price constraint for person 1 (must be <= max_price)
-            if price1 > max_price:
-                price_filtered_count += len(flights2)
-                logger.debug(f"      Person 1 flight price {price1} {currency1} exceeds max {max_price} EUR")
+        logger.debug("   Comparing %d × %d = %d possible flight combinations...", len(flights1), len(flights2), len(flights1) * len(flights2))
+        
+        # Project each flight to (price, input position, flight) once and sort by price, so
+        # flights above max_price form a suffix that can be cut off with a binary search,
+        # instead of being rejected in every combination
+        total_combinations = len(flights1) * len(flights2)
+        priced1 = sorted(((self._get_price(f), order, f) for order, f in enumerate(flights1)), key=itemgetter(0))
+        priced2 = sorted(((self._get_price(f), order, f) for order, f in enumerate(flights2)), key=itemgetter(0))
+        affordable1 = bisect_right(priced1, max_price, key=itemgetter(0))
+        affordable2 = bisect_right(priced2, max_price, key=itemgetter(0))
+        if affordable1 < len(flights1):
+            logger.debug("      %d Person 1 flight(s) exceed max %s EUR", len(flights1) - affordable1, max_price)
+        if affordable2 < len(flights2):
+            logger.debug("      %d Person 2 flight(s) exceed max %s EUR", len(flights2) - affordable2, max_price)
+        price_filtered_count = total_combinations - affordable1 * affordable2
+        
+        # Add the time each flight is matched on, parsed once up front, so the pairing
+        # loop only unpacks (price, input position, time, flight) tuples
+        # For "return": match departure times (when they leave destination)
+        # For "both" or "outbound": match arrival times (when they arrive at destination)
+        get_match_time = self._get_departure_time if flight_type == "return" else self._get_outbound_arrival_time
+        projected1 = [(price, order, self._parse_flight_time(get_match_time(f)), f) for price, order, f in priced1[:affordable1]]
+        projected2 = [(price, order, self._parse_flight_time(get_match_time(f)), f) for price, order, f in priced2[:affordable2]]
+        
+        # Index Person 2 flights by match time, so each Person 1 flight only visits the
+        # flights inside its tolerance window (found by binary search) instead of all of them.
+        # Naive and timezone-aware times can't be compared, so they are indexed separately.
+        tolerance_seconds = arrival_tolerance_hours * 3600
+        times_by_kind = {}
+        for index, (_, _, time2, _) in enumerate(projected2):
+            if time2 is not None:
+                is_aware, seconds = self._time_to_seconds(time2)
+                times_by_kind.setdefault(is_aware, []).append((seconds, index))
+        for times in times_by_kind.values():
+            times.sort()
+        seconds_by_kind = {kind: [seconds for seconds, _ in times] for kind, times in times_by_kind.items()}
+        
+        # Matches are collected as (total price, input positions, pair) so that equal totals
+        # can be sorted back into input order, as the full flights1 x flights2 scan produced them
+        matches = []
+        for price1, order1, time1, f1 in projected1:
+            if time1 is None:
                 continue
-            
-            for f2 in flights2:
-                # Get price and currency
-                price_info2 = f2.get('price', {})
-                price2 = float(price_info2.get('total', 0))
-                currency2 = price_info2.get('currency', 'EUR')
-                
-                # Check price constraint for person 2 (must be <= max_price)
-                if price2 > max_price:
-                    price_filtered_count += 1
-                    logger.debug(f"      Person 2 flight price {price2} {currency2} exceeds max {max_price} EUR")
-                    continue
-                
-                total_price = price1 + price2
-                
-                # Check time matching based on flight type
-                # For "outbound": match arrival times (when they arrive at destination)
-                # For "return": match departure times (when they leave destination)
-                # For "both": match arrival times (when they arrive at destination)
-                if flight_type == "return":
-                    # For return flights, match departure times (when leaving destination)
-                    if self._departures_match(f1, f2, arrival_tolerance_hours):
-                        matching_pairs.append({
-                            'destination': destination,
-                            'person1_flight': f1,
-                            'person2_flight': f2,
-                            'total_price': total_price,
-                            'person1_price': price1,
-                            'person2_price': price2
-                        })
-                    else:
-                        time_filtered_count += 1
-                else:
-                    # For "both" or "outbound": match arrival times (when arriving at destination)
-                    if self._arrivals_match(f1, f2, arrival_tolerance_hours):
-                        matching_pairs.append({
-                            'destination': destination,
-                            'person1_flight': f1,
-                            'person2_flight': f2,
-                            'total_price': total_price,
-                            'person1_price': price1,
-                            'person2_price': price2
-                        })
-                    else:
-                        time_filtered_count += 1
+            is_aware, seconds1 = self._time_to_seconds(time1)
+            times = times_by_kind.get(is_aware)
+            if not times:
+                continue
+            seconds = seconds_by_kind[is_aware]
+            start = bisect_left(seconds, seconds1 - tolerance_seconds)
+            end = bisect_right(seconds, seconds1 + tolerance_seconds)
+            
+            for _, index in times[start:end]:
+                price2, order2, _, f2 = projected2[index]
+                matches.append((price1 + price2, order1, order2, {
+                    'destination': destination,
+                    'person1_flight': f1,
+                    'person2_flight': f2,
+                    'total_price': price1 + price2,
+                    'person1_price': price1,
+                    'person2_price': price2
+                }))
+        
+        # Sort by total price (ties keep input order)
+        matches.sort(key=itemgetter(0, 1, 2))
+        matching_pairs = [pair for _, _, _, pair in matches]
+        
+        # Every affordable combination that wasn't paired failed the time check
+        time_filtered_count = len(projected1) * len(projected2) - len(matching_pairs)
         
         if price_filtered_count > 0:
-            logger.debug(f"   Filtered out {price_filtered_count} combination(s) due to price constraints")
+            logger.debug("   Filtered out %d combination(s) due to price constraints", price_filtered_count)
         if time_filtered_count > 0:
             match_type = "departure" if flight_type == "return" else "arrival"
-            logger.debug(f"   Filtered out {time_filtered_count} combination(s) due to {match_type} time mismatch")
-        
-        # Sort by total price
-        matching_pairs.sort(key=lambda x: x['total_price'])
+            logger.debug("   Filtered out %d combination(s) due to %s time mismatch", time_filtered_count, match_type)
         
         if matching_pairs:
             logger.info(f"   ✓ Found {len(matching_pairs)} matching flight pair(s) for {format_airport_code(destination_resolved)}")
@@ -2036,35 +2257,59 @@ class FlightSearch:
         
         return matching_pairs
     
-    def _arrivals_match(self, flight1: Dict, flight2: Dict, tolerance_hours: int) -> bool:
-        """Check if two flights arrive within the tolerance window"""
+    @staticmethod
+    def _get_price(flight: Dict) -> float:
+        """Get the total price of a flight offer as a float"""
         try:
-            # Get outbound arrival times
-            arr1 = self._get_outbound_arrival_time(flight1)
-            arr2 = self._get_outbound_arrival_time(flight2)
-            
-            if not arr1 or not arr2:
-                logger.debug(f"      Cannot compare arrivals: missing arrival time data")
-                return False
-            
-            # Parse times
-            time1 = datetime.fromisoformat(arr1.replace('Z', '+00:00'))
-            time2 = datetime.fromisoformat(arr2.replace('Z', '+00:00'))
-            
-            # Check if within tolerance
-            time_diff = abs((time1 - time2).total_seconds() / 3600)
-            matches = time_diff <= tolerance_hours
-            
-            if matches:
-                logger.debug(f"      ✓ Arrivals match: {time_diff:.1f}h difference (within ±{tolerance_hours}h tolerance)")
-            else:
-                logger.debug(f"      ✗ Arrivals don't match: {time_diff:.1f}h difference (exceeds ±{tolerance_hours}h tolerance)")
-            
-            return matches
-            
-        except Exception as e:
-            logger.debug(f"      Error checking arrival match: {e}")
-            return False
+            return float(flight['price']['total'])
+        except KeyError:
+            return 0.0
+    
+    @staticmethod
+    def _price_parts(flight: Dict) -> tuple:
+        """
+        Read the price fields of a one-way offer that a combined round trip sums up
+        
+        Args:
+            flight: Flight offer dictionary
+        
+        Returns:
+            Tuple of (currency, total, base, grand total, fees list), amounts as floats
+        """
+        price = flight.get('price', {})
+        return (
+            price.get('currency', 'EUR'),
+            float(price.get('total', '0')),
+            float(price.get('base', '0')),
+            float(price.get('grandTotal', '0')),
+            price.get('fees', [])
+        )
+    
+    @staticmethod
+    def _parse_flight_time(time_str: Optional[str]) -> Optional[datetime]:
+        """Parse an ISO 8601 flight time, returning None if it is missing or malformed"""
+        if not time_str:
+            return None
+        try:
+            return datetime.fromisoformat(time_str)
+        except (ValueError, TypeError):
+            return None
+    
+    @staticmethod
+    def _time_to_seconds(time: datetime) -> Tuple[bool, float]:
+        """
+        Convert a parsed flight time to a sortable number of seconds
+        
+        Args:
+            time: Parsed flight time (naive or timezone-aware)
+        
+        Returns:
+            Tuple of (is timezone-aware, seconds since the epoch). Naive times are
+            counted on their own wall clock, so only times of the same kind are comparable.
+        """
+        if time.tzinfo is not None:
+            return True, time.timestamp()
+        return False, (time - datetime(1970, 1, 1)).total_seconds()
     
     def _get_outbound_arrival_time(self, flight: Dict) -> Optional[str]:
         """Get outbound arrival time from flight offer"""
@@ -2078,36 +2323,6 @@ class FlightSearch:
             pass
         return None
     
-    def _departures_match(self, flight1: Dict, flight2: Dict, tolerance_hours: int) -> bool:
-        """Check if two flights depart within the tolerance window"""
-        try:
-            # Get departure times from first itinerary (for one-way flights, this is the only itinerary)
-            dep1 = self._get_departure_time(flight1)
-            dep2 = self._get_departure_time(flight2)
-            
-            if not dep1 or not dep2:
-                logger.debug(f"      Cannot compare departures: missing departure time data")
-                return False
-            
-            # Parse times
-            time1 = datetime.fromisoformat(dep1.replace('Z', '+00:00'))
-            time2 = datetime.fromisoformat(dep2.replace('Z', '+00:00'))
-            
-            # Check if within tolerance
-            time_diff = abs((time1 - time2).total_seconds() / 3600)
-            matches = time_diff <= tolerance_hours
-            
-            if matches:
-                logger.debug(f"      ✓ Departures match: {time_diff:.1f}h difference (within ±{tolerance_hours}h tolerance)")
-            else:
-                logger.debug(f"      ✗ Departures don't match: {time_diff:.1f}h difference (exceeds ±{tolerance_hours}h tolerance)")
-            
-            return matches
-            
-        except Exception as e:
-            logger.debug(f"      Error checking departure match: {e}")
-            return False
-    
     def _get_departure_time(self, flight: Dict) -> Optional[str]:
         """Get departure time from flight offer (first itinerary, first segment)"""
         try:
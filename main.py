@@ -7,75 +7,336 @@ Version: 1.1.0
 """
 __version__ = "1.1.0"
 import yaml
+import json
 import os
 import sys
-from typing import Optional
-from flight_search import FlightSearch
-from destination_finder import DestinationFinder
-from output_formatter import OutputFormatter
+import tomllib
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import List, Optional
 import logging
-from datetime import datetime
+import logging.handlers
+import atexit
+import queue
 
-# Configure logging with both console and file handlers
-log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-
-# Create debug logs directory if it doesn't exist
-os.makedirs('debug_logs', exist_ok=True)
+# Use the libyaml C parser when PyYAML was built with it, otherwise the pure-Python one
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
-# Create file handler for debug logs
-log_filename = f"debug_logs/flight_search_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-file_handler = logging.FileHandler(log_filename, encoding='utf-8')
-file_handler.setLevel(logging.DEBUG)
-file_handler.setFormatter(logging.Formatter(log_format))
+# Configure logging with a console handler, plus a debug log file when
+# FLADAR_DEBUG_LOG is set
+log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+debug_log_enabled = bool(os.environ.get('FLADAR_DEBUG_LOG'))
+root_logger = logging.getLogger()
+# Without the debug log file nothing consumes DEBUG records, so skip creating them
+root_logger.setLevel(logging.DEBUG if debug_log_enabled else logging.INFO)
 
 # Create console handler (INFO level for console, DEBUG for file)
+# It is attached directly, so console log lines stay in order with print() output
 console_handler = logging.StreamHandler()
 console_handler.setLevel(logging.INFO)
 console_handler.setFormatter(logging.Formatter(log_format))
-
-# Configure root logger
-root_logger = logging.getLogger()
-root_logger.setLevel(logging.DEBUG)
-root_logger.addHandler(file_handler)
 root_logger.addHandler(console_handler)
 
+if debug_log_enabled:
+    # Create debug logs directory if it doesn't exist
+    os.makedirs('debug_logs', exist_ok=True)
+    
+    # Create file handler for debug logs (one file, rotated to bound disk usage)
+    log_filename = "debug_logs/flight_search.log"
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_filename, maxBytes=5_000_000, backupCount=5, encoding='utf-8'
+    )
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(logging.Formatter(log_format))
+    
+    # Debug records are queued and written to the file by a background listener thread,
+    # so logging calls (including from search worker threads) never block on file I/O
+    log_queue = queue.Queue(-1)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    log_listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    log_listener.start()
+    # Flush any queued records on exit (including sys.exit on config errors)
+    atexit.register(log_listener.stop)
+
 logger = logging.getLogger(__name__)
-logger.info(f"Debug logs will be saved to: {log_filename}")
+if debug_log_enabled:
+    logger.info(f"Debug logs will be saved to: {log_filename}")
+
+# Airport code to city name mapping for display (read-only)
+AIRPORT_NAMES = MappingProxyType({
+    'TLV': 'Tel Aviv',
+    'ALC': 'Alicante',
+    'BCN': 'Barcelona',
+    'LON': 'London',
+    'PAR': 'Paris',
+    'MAD': 'Madrid',
+    'ROM': 'Rome',
+    'AMS': 'Amsterdam',
+    'BER': 'Berlin',
+    'VIE': 'Vienna',
+    'PRG': 'Prague',
+    'ATH': 'Athens',
+    'LIS': 'Lisbon',
+    'DUB': 'Dublin',
+    'CPH': 'Copenhagen',
+    'STO': 'Stockholm',
+    'OSL': 'Oslo',
+    'MUC': 'Munich',
+    'FCO': 'Rome',
+    'AGP': 'Malaga',
+    'SEV': 'Seville',
+    'ZUR': 'Zurich',
+    'BRU': 'Brussels',
+    'WAR': 'Warsaw',
+    'BUD': 'Budapest',
+    'ZAG': 'Zagreb',
+    'HEL': 'Helsinki',
+    'REK': 'Reykjavik',
+    'OPO': 'Porto',
+})
+
+
+# Required configuration structure, checked by validate_config
+# Each section lists its 'required' keys; 'non_empty' also rejects empty values
+_CONFIG_SCHEMA = {
+    'required': ('origins', 'search', 'api'),
+    'properties': {
+        'origins': {'required': ('person1', 'person2'), 'non_empty': True},
+        'search': {'required': ('outbound_date', 'max_price')},
+        'api': {'required': ('amadeus_api_key', 'amadeus_api_secret'), 'non_empty': True},
+    },
+}
+
+
+# Configuration files looked for in the working directory, in order of preference
+CONFIG_FILES = ('config.yaml', 'config.toml', 'config.json')
+
+
+def find_config_file() -> str:
+    """Get the first configuration file in CONFIG_FILES that exists (config.yaml if none do)"""
+    for config_path in CONFIG_FILES:
+        if os.path.exists(config_path):
+            return config_path
+    return CONFIG_FILES[0]
 
 
 def load_config(config_path: str = "config.yaml") -> dict:
-    """Load configuration from YAML file"""
+    """
+    Load configuration from a YAML, TOML or JSON file
+    
+    The format is picked from the file extension (.toml, .json, anything else is YAML).
+    TOML and JSON are parsed by the standard library directly.
+    """
+    suffix = os.path.splitext(config_path)[1].lower()
     try:
+        if suffix == '.toml':
+            with open(config_path, 'rb') as f:
+                return tomllib.load(f)
+        if suffix == '.json':
+            with open(config_path, 'rb') as f:
+                return json.load(f)
+        
         with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=_YamlLoader)
+        logger.debug(f"Loaded {config_path} with {_YamlLoader.__name__}")
         return config
     except FileNotFoundError:
         logger.error(f"Configuration file not found: {config_path}")
         sys.exit(1)
-    except yaml.YAMLError as e:
+    except (yaml.YAMLError, tomllib.TOMLDecodeError, json.JSONDecodeError) as e:
         logger.error(f"Error parsing configuration file: {e}")
         sys.exit(1)
 
 
-def validate_config(config: dict) -> bool:
-    """Validate configuration"""
-    required_keys = [
-        'origins', 'search', 'api'
-    ]
+def _compile_config_schema(schema: dict, path: str = ""):
+    """
+    Compile a _CONFIG_SCHEMA entry into a checking function
+    
+    Key paths and nested section checkers are worked out once here, so checking
+    a configuration doesn't walk the schema again.
     
-    for key in required_keys:
-        if key not in config:
-            logger.error(f"Missing required configuration key: {key}")
-            return False
+    Args:
+        schema: Schema for this section ('required' keys, 'non_empty' flag, nested 'properties')
+        path: Dotted path of this section, used in error messages
+    
+    Returns:
+        Function taking (config section, errors list) that appends a
+        (dotted key path, problem) tuple for every mismatch
+    """
+    section_path = path or 'config'
+    non_empty = schema.get('non_empty', False)
+    required = tuple(
+        (key, f"{path}.{key}" if path else key) for key in schema.get('required', ())
+    )
+    sections = tuple(
+        (key, _compile_config_schema(section_schema, f"{path}.{key}" if path else key))
+        for key, section_schema in schema.get('properties', {}).items()
+    )
+    
+    def check_section(config, errors: list):
+        if not isinstance(config, dict):
+            errors.append((section_path, 'must be a mapping'))
+            return
+        
+        for key, key_path in required:
+            if key not in config:
+                errors.append((key_path, 'missing'))
+            elif non_empty and not config[key]:
+                errors.append((key_path, 'empty'))
+        
+        for key, check_nested in sections:
+            if key in config:
+                check_nested(config[key], errors)
+    
+    return check_section
+
+
+_check_config = _compile_config_schema(_CONFIG_SCHEMA)
+
+
+def validate_config(config: dict, config_path: str = "config.yaml") -> bool:
+    """
+    Validate configuration against _CONFIG_SCHEMA
+    
+    Args:
+        config: Configuration loaded by load_config()
+        config_path: File the configuration was loaded from, named in error messages
+    
+    Returns:
+        True if the configuration is valid, False otherwise (problems are logged)
+    """
+    errors = []
+    _check_config(config, errors)
+    
+    for key_path, problem in errors:
+        if key_path.startswith('api.'):
+            continue  # Reported together below
+        if problem == 'missing':
+            logger.error(f"Missing required configuration key: {key_path}")
+        else:
+            logger.error(f"Invalid configuration key {key_path}: {problem}")
     
     # Check API credentials
-    if not config['api'].get('amadeus_api_key') or not config['api'].get('amadeus_api_secret'):
-        logger.error("Amadeus API credentials not set in config.yaml")
+    if any(key_path.startswith('api.') for key_path, _ in errors):
+        logger.error(f"Amadeus API credentials not set in {config_path}")
         logger.error("Please get your free API key at: https://developers.amadeus.com/")
-        logger.error("Then add your credentials to config.yaml")
-        return False
+        logger.error(f"Then add your credentials to {config_path}")
+    
+    return not errors
+
+
+@dataclass(frozen=True, slots=True)
+class AppConfig:
+    """Settings used by a search run, read once from the validated configuration"""
+    origin1: str
+    origin2: str
+    api_key: str
+    api_secret: str
+    environment: str
+    departure_date: str
+    return_date: Optional[str]
+    flight_type: str
+    max_price: float
+    max_stops_person1: int
+    max_stops_person2: int
+    arrival_tolerance_hours: float
+    min_departure_time_outbound: Optional[str]
+    min_departure_time_return: Optional[str]
+    use_dynamic_destinations: bool
+    max_flight_duration_person1: float
+    max_flight_duration_person2: float
+    cache_expiration_days: int
+    nearby_airports_radius_km: int
+    return_airport_radius_km: int
+    max_destinations_to_check: int
+    max_parallel_destinations: int
+    use_flight_cache: bool
+    destinations_to_check: List[str]
+    output_format: str
+    csv_file: str
+    html_file: str
+    html_top_destinations: int
+    booking_link_provider: str
     
-    return True
+    @classmethod
+    def from_dict(cls, config: dict) -> "AppConfig":
+        """
+        Build the run settings from a validated configuration dictionary
+        
+        Args:
+            config: Configuration loaded from config.yaml (see validate_config)
+        
+        Returns:
+            AppConfig with defaults applied and deprecated keys translated
+        
+        Raises:
+            KeyError: If a required setting (origins, outbound_date, max_price) is missing
+        """
+        search_config = config['search']
+        api_config = config['api']
+        output_config = config.get('output', {})
+        
+        # Handle backward compatibility: check for old max_stops parameter
+        if 'max_stops' in search_config and 'max_stops_person1' not in search_config:
+            old_max_stops = search_config.get('max_stops', 0)
+            logger.warning(f"⚠️  DEPRECATED: Old 'max_stops' parameter detected (value: {old_max_stops})")
+            logger.warning(f"   Please update your config.yaml to use 'max_stops_person1' and 'max_stops_person2'")
+            logger.warning(f"   See docs/MIGRATION_GUIDE.md for migration instructions")
+            logger.warning(f"   Using {old_max_stops} for both persons as fallback")
+            max_stops_person1 = old_max_stops
+            max_stops_person2 = old_max_stops
+        else:
+            max_stops_person1 = search_config.get('max_stops_person1', 0)
+            max_stops_person2 = search_config.get('max_stops_person2', 0)
+        
+        # Handle backward compatibility: check for old max_flight_duration_hours parameter
+        if 'max_flight_duration_hours' in search_config and 'max_flight_duration_hours_person1' not in search_config:
+            old_max_duration = float(search_config.get('max_flight_duration_hours', 0))
+            logger.warning(f"⚠️  DEPRECATED: Old 'max_flight_duration_hours' parameter detected (value: {old_max_duration})")
+            logger.warning(f"   Please update your config.yaml to use 'max_flight_duration_hours_person1' and 'max_flight_duration_hours_person2'")
+            logger.warning(f"   Using {old_max_duration} for both persons as fallback")
+            max_flight_duration_person1 = old_max_duration
+            max_flight_duration_person2 = old_max_duration
+        else:
+            max_flight_duration_person1 = float(search_config.get('max_flight_duration_hours_person1', 0))
+            max_flight_duration_person2 = float(search_config.get('max_flight_duration_hours_person2', 0))
+        
+        return cls(
+            origin1=config['origins']['person1'],
+            origin2=config['origins']['person2'],
+            api_key=api_config['amadeus_api_key'],
+            api_secret=api_config['amadeus_api_secret'],
+            environment=api_config.get('environment', 'test'),
+            departure_date=search_config['outbound_date'],
+            return_date=search_config.get('return_date'),
+            flight_type=search_config.get('flight_type', 'both'),  # Default to "both" for backward compatibility
+            max_price=float(search_config['max_price']),
+            max_stops_person1=max_stops_person1,
+            max_stops_person2=max_stops_person2,
+            arrival_tolerance_hours=search_config.get('arrival_tolerance_hours', 3),
+            min_departure_time_outbound=search_config.get('min_departure_time_outbound') or None,
+            min_departure_time_return=search_config.get('min_departure_time_return') or None,
+            use_dynamic_destinations=search_config.get('use_dynamic_destinations', True),
+            max_flight_duration_person1=max_flight_duration_person1,
+            max_flight_duration_person2=max_flight_duration_person2,
+            cache_expiration_days=search_config.get('destination_cache_expiration_days', 30),
+            nearby_airports_radius_km=search_config.get('nearby_airports_radius_km', 0),
+            return_airport_radius_km=search_config.get('return_airport_radius_km', 0),
+            max_destinations_to_check=search_config.get('max_destinations_to_check', 50),
+            max_parallel_destinations=search_config.get('max_parallel_destinations', 1),
+            use_flight_cache=search_config.get('use_flight_cache', True),
+            # Check for destinations_to_check in search section first, then root level (for backward compatibility)
+            destinations_to_check=search_config.get('destinations_to_check') or config.get('destinations_to_check', []),
+            output_format=output_config.get('format', 'console'),
+            csv_file=output_config.get('csv_file', 'flight_results.csv'),
+            html_file=output_config.get('html_file', 'flight_results.html'),
+            html_top_destinations=output_config.get('html_top_destinations', 3),
+            booking_link_provider=output_config.get('booking_link_provider', 'google_flights')  # Default to Google Flights
+        )
 
 
 def main():
@@ -85,202 +346,127 @@ def main():
     print("=" * 100)
     
     # Load configuration
-    config = load_config()
+    config_path = find_config_file()
+    config = load_config(config_path)
     
     # Validate configuration
-    if not validate_config(config):
+    if not validate_config(config, config_path):
         sys.exit(1)
     
     # Extract configuration
-    origin1 = config['origins']['person1']
-    origin2 = config['origins']['person2']
-    search_config = config['search']
-    api_config = config['api']
-    output_config = config.get('output', {})
-    html_top_destinations = output_config.get('html_top_destinations', 3)
-    booking_link_provider = output_config.get('booking_link_provider', 'google_flights')  # Default to Google Flights
+    cfg = AppConfig.from_dict(config)
     
     # Delete existing CSV and HTML output files from previous run if they exist
-    output_format = output_config.get('format', 'console')
-    csv_file = output_config.get('csv_file', 'flight_results.csv')
-    html_file = output_config.get('html_file', 'flight_results.html')
-    if 'csv' in output_format:
-        if os.path.exists(csv_file):
-            try:
-                os.remove(csv_file)
-                logger.info(f"Deleted previous CSV output file: {csv_file}")
-            except Exception as e:
-                logger.warning(f"Could not delete previous CSV file {csv_file}: {e}")
+    if 'csv' in cfg.output_format:
+        try:
+            Path(cfg.csv_file).unlink()
+            logger.info(f"Deleted previous CSV output file: {cfg.csv_file}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not delete previous CSV file {cfg.csv_file}: {e}")
         # Also delete HTML file if it exists
-        if os.path.exists(html_file):
-            try:
-                os.remove(html_file)
-                logger.info(f"Deleted previous HTML output file: {html_file}")
-            except Exception as e:
-                logger.warning(f"Could not delete previous HTML file {html_file}: {e}")
-    
-    departure_date = search_config['outbound_date']
-    flight_type = search_config.get('flight_type', 'both')  # Default to "both" for backward compatibility
+        try:
+            Path(cfg.html_file).unlink()
+            logger.info(f"Deleted previous HTML output file: {cfg.html_file}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not delete previous HTML file {cfg.html_file}: {e}")
     
     # Validate return_date based on flight_type
-    return_date = search_config.get('return_date')
-    if flight_type in ['both', 'return']:
-        if not return_date:
-            logger.error(f"❌ return_date is required for flight_type='{flight_type}'")
+    if cfg.flight_type in ['both', 'return']:
+        if not cfg.return_date:
+            logger.error(f"❌ return_date is required for flight_type='{cfg.flight_type}'")
             logger.error(f"   Please add return_date to your config.yaml")
             sys.exit(1)
     # For "outbound", return_date is optional (ignored)
     
-    max_price = float(search_config['max_price'])
-    
-    # Handle backward compatibility: check for old max_stops parameter
-    if 'max_stops' in search_config and 'max_stops_person1' not in search_config:
-        old_max_stops = search_config.get('max_stops', 0)
-        logger.warning(f"⚠️  DEPRECATED: Old 'max_stops' parameter detected (value: {old_max_stops})")
-        logger.warning(f"   Please update your config.yaml to use 'max_stops_person1' and 'max_stops_person2'")
-        logger.warning(f"   See docs/MIGRATION_GUIDE.md for migration instructions")
-        logger.warning(f"   Using {old_max_stops} for both persons as fallback")
-        max_stops_person1 = old_max_stops
-        max_stops_person2 = old_max_stops
-    else:
-        max_stops_person1 = search_config.get('max_stops_person1', 0)
-        max_stops_person2 = search_config.get('max_stops_person2', 0)
-    arrival_tolerance = search_config.get('arrival_tolerance_hours', 3)
-    min_departure_time_outbound = search_config.get('min_departure_time_outbound') or None
-    min_departure_time_return = search_config.get('min_departure_time_return') or None
-    use_dynamic_destinations = search_config.get('use_dynamic_destinations', True)
-    # Handle backward compatibility: check for old max_flight_duration_hours parameter
-    if 'max_flight_duration_hours' in search_config and 'max_flight_duration_hours_person1' not in search_config:
-        old_max_duration = float(search_config.get('max_flight_duration_hours', 0))
-        logger.warning(f"⚠️  DEPRECATED: Old 'max_flight_duration_hours' parameter detected (value: {old_max_duration})")
-        logger.warning(f"   Please update your config.yaml to use 'max_flight_duration_hours_person1' and 'max_flight_duration_hours_person2'")
-        logger.warning(f"   Using {old_max_duration} for both persons as fallback")
-        max_flight_duration_person1 = old_max_duration
-        max_flight_duration_person2 = old_max_duration
-    else:
-        max_flight_duration_person1 = float(search_config.get('max_flight_duration_hours_person1', 0))
-        max_flight_duration_person2 = float(search_config.get('max_flight_duration_hours_person2', 0))
-    cache_expiration_days = search_config.get('destination_cache_expiration_days', 30)
-    nearby_airports_radius_km = search_config.get('nearby_airports_radius_km', 0)
-    return_airport_radius_km = search_config.get('return_airport_radius_km', 0)
-    max_destinations_to_check = search_config.get('max_destinations_to_check', 50)
-    use_flight_cache = search_config.get('use_flight_cache', True)
-    # Check for destinations_to_check in search section first, then root level (for backward compatibility)
-    destinations_to_check = search_config.get('destinations_to_check') or config.get('destinations_to_check', [])
-    
     # Timezones are now automatically detected using airportsdata library
     # No manual configuration needed
     
+    # Import the search modules (Amadeus SDK, airport/timezone data) only once
+    # the configuration is known to be usable, so config errors fail fast
+    from flight_search import FlightSearch
+    from destination_finder import DestinationFinder
+    from output_formatter import OutputFormatter
+    
     # Initialize flight search
     try:
-        environment = api_config.get('environment', 'test')
         flight_search = FlightSearch(
-            api_key=api_config['amadeus_api_key'],
-            api_secret=api_config['amadeus_api_secret'],
-            environment=environment,
-            cache_expiration_days=cache_expiration_days,
-            use_flight_cache=use_flight_cache
+            api_key=cfg.api_key,
+            api_secret=cfg.api_secret,
+            environment=cfg.environment,
+            cache_expiration_days=cfg.cache_expiration_days,
+            use_flight_cache=cfg.use_flight_cache
         )
     except Exception as e:
         logger.error(f"Failed to initialize flight search: {e}")
         sys.exit(1)
     
     # Initialize destination finder
-    destination_finder = DestinationFinder(flight_search)
-    
-    # Airport code to city name mapping for display
-    airport_names = {
-        'TLV': 'Tel Aviv',
-        'ALC': 'Alicante',
-        'BCN': 'Barcelona',
-        'LON': 'London',
-        'PAR': 'Paris',
-        'MAD': 'Madrid',
-        'ROM': 'Rome',
-        'AMS': 'Amsterdam',
-        'BER': 'Berlin',
-        'VIE': 'Vienna',
-        'PRG': 'Prague',
-        'ATH': 'Athens',
-        'LIS': 'Lisbon',
-        'DUB': 'Dublin',
-        'CPH': 'Copenhagen',
-        'STO': 'Stockholm',
-        'OSL': 'Oslo',
-        'MUC': 'Munich',
-        'FCO': 'Rome',
-        'BCN': 'Barcelona',
-        'AGP': 'Malaga',
-        'SEV': 'Seville',
-        'ZUR': 'Zurich',
-        'BRU': 'Brussels',
-        'WAR': 'Warsaw',
-        'BUD': 'Budapest',
-        'ZAG': 'Zagreb',
-        'HEL': 'Helsinki',
-        'REK': 'Reykjavik',
-        'OPO': 'Porto',
-    }
+    destination_finder = DestinationFinder(flight_search, max_parallel_destinations=cfg.max_parallel_destinations)
     
     # Get city names for display
-    origin1_name = airport_names.get(origin1.upper(), origin1)
-    origin2_name = airport_names.get(origin2.upper(), origin2)
+    origin1_name = AIRPORT_NAMES.get(cfg.origin1.upper(), cfg.origin1)
+    origin2_name = AIRPORT_NAMES.get(cfg.origin2.upper(), cfg.origin2)
     
     # Display search parameters
     print(f"\n🔍 Search Parameters:")
-    print(f"   Person 1 Origin: {origin1} ({origin1_name})")
-    print(f"   Person 2 Origin: {origin2} ({origin2_name})")
-    print(f"   Outbound Date: {departure_date}")
-    print(f"   Return Date: {return_date}")
-    print(f"   Max Price (per person): {max_price} EUR")
-    print(f"   Max Stops - Person 1: {max_stops_person1}")
-    print(f"   Max Stops - Person 2: {max_stops_person2}")
-    print(f"   Flight Type: {flight_type}")
-    print(f"   Arrival Tolerance: ±{arrival_tolerance} hours")
-    if max_flight_duration_person1 > 0 or max_flight_duration_person2 > 0:
-        print(f"   Max Flight Duration - Person 1: {max_flight_duration_person1} hours" + (" (no limit)" if max_flight_duration_person1 == 0 else ""))
-        print(f"   Max Flight Duration - Person 2: {max_flight_duration_person2} hours" + (" (no limit)" if max_flight_duration_person2 == 0 else ""))
-    print(f"   Destination Discovery: {'Dynamic (Amadeus API)' if use_dynamic_destinations else 'Predefined List'}")
-    if min_departure_time_outbound:
-        print(f"   Min Departure Time (Outbound): {min_departure_time_outbound}")
-    if min_departure_time_return:
-        print(f"   Min Departure Time (Return): {min_departure_time_return}")
-    if nearby_airports_radius_km > 0:
-        print(f"   Nearby Airports Radius: {nearby_airports_radius_km} km")
-    if return_airport_radius_km > 0:
-        print(f"   Return Airport Radius: {return_airport_radius_km} km (return flights can depart from nearby airports)")
-    if destinations_to_check and len(destinations_to_check) > 0:
-        print(f"   Specific Destinations to Check: {', '.join(destinations_to_check)}")
+    print(f"   Person 1 Origin: {cfg.origin1} ({origin1_name})")
+    print(f"   Person 2 Origin: {cfg.origin2} ({origin2_name})")
+    print(f"   Outbound Date: {cfg.departure_date}")
+    print(f"   Return Date: {cfg.return_date}")
+    print(f"   Max Price (per person): {cfg.max_price} EUR")
+    print(f"   Max Stops - Person 1: {cfg.max_stops_person1}")
+    print(f"   Max Stops - Person 2: {cfg.max_stops_person2}")
+    print(f"   Flight Type: {cfg.flight_type}")
+    print(f"   Arrival Tolerance: ±{cfg.arrival_tolerance_hours} hours")
+    if cfg.max_flight_duration_person1 > 0 or cfg.max_flight_duration_person2 > 0:
+        print(f"   Max Flight Duration - Person 1: {cfg.max_flight_duration_person1} hours" + (" (no limit)" if cfg.max_flight_duration_person1 == 0 else ""))
+        print(f"   Max Flight Duration - Person 2: {cfg.max_flight_duration_person2} hours" + (" (no limit)" if cfg.max_flight_duration_person2 == 0 else ""))
+    print(f"   Destination Discovery: {'Dynamic (Amadeus API)' if cfg.use_dynamic_destinations else 'Predefined List'}")
+    if cfg.min_departure_time_outbound:
+        print(f"   Min Departure Time (Outbound): {cfg.min_departure_time_outbound}")
+    if cfg.min_departure_time_return:
+        print(f"   Min Departure Time (Return): {cfg.min_departure_time_return}")
+    if cfg.nearby_airports_radius_km > 0:
+        print(f"   Nearby Airports Radius: {cfg.nearby_airports_radius_km} km")
+    if cfg.return_airport_radius_km > 0:
+        print(f"   Return Airport Radius: {cfg.return_airport_radius_km} km (return flights can depart from nearby airports)")
+    if cfg.destinations_to_check and len(cfg.destinations_to_check) > 0:
+        print(f"   Specific Destinations to Check: {', '.join(cfg.destinations_to_check)}")
         print(f"   (Skipping destination discovery - using only specified destinations)")
     else:
-        if max_destinations_to_check > 0:
-            print(f"   Max Destinations to Check: {max_destinations_to_check}")
+        if cfg.max_destinations_to_check > 0:
+            print(f"   Max Destinations to Check: {cfg.max_destinations_to_check}")
         else:
             print(f"   Max Destinations to Check: All available")
+    print(f"   Parallel Destination Searches: {cfg.max_parallel_destinations}")
     print()
     
     # Find matching destinations
     print("🔎 Searching for matching flights...")
     print()
     results = destination_finder.find_meeting_destinations(
-        origin1=origin1,
-        origin2=origin2,
-        departure_date=departure_date,
-        return_date=return_date,
-        max_price=max_price,
-        max_stops_person1=max_stops_person1,
-        max_stops_person2=max_stops_person2,
-        arrival_tolerance_hours=arrival_tolerance,
-        min_departure_time_outbound=min_departure_time_outbound,
-        min_departure_time_return=min_departure_time_return,
-        use_dynamic_destinations=use_dynamic_destinations,
-        max_flight_duration_hours_person1=max_flight_duration_person1,
-        max_flight_duration_hours_person2=max_flight_duration_person2,
-        nearby_airports_radius_km=nearby_airports_radius_km,
-        return_airport_radius_km=return_airport_radius_km,
-        max_destinations=max_destinations_to_check,
-        destinations_to_check=destinations_to_check,
-        flight_type=flight_type
+        origin1=cfg.origin1,
+        origin2=cfg.origin2,
+        departure_date=cfg.departure_date,
+        return_date=cfg.return_date,
+        max_price=cfg.max_price,
+        max_stops_person1=cfg.max_stops_person1,
+        max_stops_person2=cfg.max_stops_person2,
+        arrival_tolerance_hours=cfg.arrival_tolerance_hours,
+        min_departure_time_outbound=cfg.min_departure_time_outbound,
+        min_departure_time_return=cfg.min_departure_time_return,
+        use_dynamic_destinations=cfg.use_dynamic_destinations,
+        max_flight_duration_hours_person1=cfg.max_flight_duration_person1,
+        max_flight_duration_hours_person2=cfg.max_flight_duration_person2,
+        nearby_airports_radius_km=cfg.nearby_airports_radius_km,
+        return_airport_radius_km=cfg.return_airport_radius_km,
+        max_destinations=cfg.max_destinations_to_check,
+        destinations_to_check=cfg.destinations_to_check,
+        flight_type=cfg.flight_type
     )
     
     # Output results
@@ -289,13 +475,13 @@ def main():
     print(f"📋 RESULTS: Found {len(results)} matching flight option(s)")
     print("=" * 100)
     
-    if 'console' in output_format:
+    if 'console' in cfg.output_format:
         OutputFormatter.print_console(results)
     
-    if 'csv' in output_format:
-        OutputFormatter.export_csv(results, csv_file)
+    if 'csv' in cfg.output_format:
+        OutputFormatter.export_csv(results, cfg.csv_file)
         # Also export HTML with top N destinations (configurable)
-        OutputFormatter.export_html(results, html_file, top_destinations=html_top_destinations, booking_link_provider=booking_link_provider)
+        OutputFormatter.export_html(results, cfg.html_file, top_destinations=cfg.html_top_destinations, booking_link_provider=cfg.booking_link_provider)
     
     print(f"\n✨ Search completed!")
 
@@ -1,26 +1,51 @@
 """
 Output formatting module for flight results
 """
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional
 from datetime import datetime
 import csv
+import itertools
 import os
+import re
+import sys
 import json
-import pytz
+import traceback
 import airportsdata
 from timezonefinder import TimezoneFinder
 import logging
+from functools import lru_cache
+from operator import itemgetter
+from types import MappingProxyType
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# orjson is optional - it parses the name mapping files faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
-# Load airport database for automatic timezone detection
-try:
-    airports = airportsdata.load('IATA')  # Load IATA code database
-    tf = TimezoneFinder()  # Initialize timezone finder
-except Exception as e:
-    logger.warning(f"Could not load airports database: {e}. Will use fallback timezone mapping.")
-    airports = None
-    tf = None
+
+@lru_cache(maxsize=None)
+def _load_timezone_sources():
+    """
+    Load the airport database and timezone finder used for automatic timezone detection
+    
+    Both take a noticeable time to load, so this happens on the first timezone
+    lookup rather than at import (console-only runs never convert times).
+    
+    Returns:
+        Tuple of (airports database, TimezoneFinder), or (None, None) if loading failed
+    """
+    try:
+        airports = airportsdata.load('IATA')  # Load IATA code database
+        tf = TimezoneFinder()  # Initialize timezone finder
+        return airports, tf
+    except Exception as e:
+        logger.warning(f"Could not load airports database: {e}. Will use fallback timezone mapping.")
+        return None, None
+
 
 # Airline code to name mapping - loaded from external file
 _AIRLINE_NAMES = None
@@ -28,68 +53,159 @@ _AIRLINE_NAMES = None
 # Airport code to name mapping - loaded from external file
 _AIRPORT_NAMES = None
 
+# format_flight_info results, keyed by id() of the flight offer dict
+# The offer is stored next to its info so the id can't be reused while cached
+# (Amadeus offer 'id' values are only unique within a single search response)
+_FLIGHT_INFO_CACHE = {}
+_FLIGHT_INFO_CACHE_MAX_SIZE = 4096
 
-def _load_airline_names():
-    """Load airline names from external JSON file"""
-    global _AIRLINE_NAMES
-    if _AIRLINE_NAMES is not None:
-        return _AIRLINE_NAMES
+# Shared read-only defaults for missing offer fields, so lookups on partial
+# offers don't allocate a fresh {} / [{}] each time
+_EMPTY = MappingProxyType({})
+_NO_ITINERARIES = (_EMPTY,)
+
+# ISO 8601 flight duration ('PT5H30M'), parsed in one pass - seconds are ignored
+_DURATION_RE = re.compile(r'(?:PT)?(?:(\d+)H)?(?:(\d+)M)?(?:\d+(?:\.\d+)?S)?')
+
+# Date part of an ISO 8601 date or date-time ('2025-11-20' or '2025-11-20T17:25:00')
+_ISO_DATE_RE = re.compile(r'(\d{2})(\d{2})-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01])(?:T|$)')
+
+# Console output templates, filled with str.format_map() for each result
+_CONSOLE_OPTION_TEMPLATE = (
+    "\n📍 Option {option}: Destination {destination}\n"
+    "💰 Total Price: {total_price:.2f} {currency} "
+    "(Person 1: {person1_price:.2f}, Person 2: {person2_price:.2f})\n"
+    + "-" * 100
+)
+_CONSOLE_PERSON_TEMPLATE = (
+    "\n👤 Person {person} ({origin} → {destination}):\n"
+    "   Outbound: {outbound_departure} → {outbound_arrival} ({outbound_duration}, {outbound_stops} stops)\n"
+    "   Return:   {return_departure} → {return_arrival} ({return_duration}, {return_stops} stops)\n"
+    "   Airlines: {airlines}\n"
+    "   Price: {price:.2f} {currency}"
+)
+
+# Write buffer for CSV exports (the default is 8 KiB), so large exports reach
+# the OS in a few large writes
+_CSV_WRITE_BUFFER_SIZE = 1 << 20
+
+# Flight info values read for each person in a CSV row (see _csv_info_fields)
+_CSV_INFO_FIELDS = itemgetter(
+    'origin', 'return_origin', 'return_destination',
+    'outbound_departure', 'outbound_arrival', 'return_departure', 'return_arrival',
+    'outbound_duration', 'return_duration', 'outbound_stops', 'return_stops',
+    'airlines_formatted'
+)
+
+# Values used in place of flight info when format_flight_info() returned an error
+_CSV_INFO_DEFAULTS = {
+    'return_origin': None, 'return_destination': None,
+    'outbound_departure': '', 'outbound_arrival': '', 'return_departure': '', 'return_arrival': '',
+    'outbound_duration': '', 'return_duration': '', 'outbound_stops': 0, 'return_stops': 0,
+    'airlines_formatted': ''
+}
+
+# CSV columns, with route and price first - _csv_row() builds rows in this order
+_CSV_FIELDNAMES = (
+    # First column: Route (From → To) - MOST IMPORTANT
+    'route',
+    # Second column: Human-readable description
+    'description',
+    'destination',
+    'total_price_eur',
+    'price_person1_eur',
+    'price_person2_eur',
+    'currency',
     
-    # Try to load from data/airline_names.json
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    airline_names_file = os.path.join(current_dir, 'data', 'airline_names.json')
+    # Person 1 details - with UTC and local times
+    'person1_route',
+    'person1_outbound_departure_utc',
+    'person1_outbound_departure_local',
+    'person1_outbound_arrival_utc',
+    'person1_outbound_arrival_local',
+    'person1_outbound_duration',
+    'person1_outbound_stops',
+    'person1_return_departure_utc',
+    'person1_return_departure_local',
+    'person1_return_arrival_utc',
+    'person1_return_arrival_local',
+    'person1_return_duration',
+    'person1_return_stops',
+    'person1_airlines',
     
-    # If not found, try relative to project root
-    if not os.path.exists(airline_names_file):
-        airline_names_file = os.path.join(current_dir, '..', 'data', 'airline_names.json')
-        airline_names_file = os.path.normpath(airline_names_file)
+    # Person 2 details - with UTC and local times
+    'person2_route',
+    'person2_outbound_departure_utc',
+    'person2_outbound_departure_local',
+    'person2_outbound_arrival_utc',
+    'person2_outbound_arrival_local',
+    'person2_outbound_duration',
+    'person2_outbound_stops',
+    'person2_return_departure_utc',
+    'person2_return_departure_local',
+    'person2_return_arrival_utc',
+    'person2_return_arrival_local',
+    'person2_return_duration',
+    'person2_return_stops',
+    'person2_airlines'
+)
+
+# Header row as csv.writer would write it (plain names need no quoting, '\r\n' line ends)
+_CSV_HEADER_LINE = ','.join(_CSV_FIELDNAMES) + '\r\n'
+
+
+def _load_names_file(filename: str, description: str) -> Dict[str, str]:
+    """
+    Load a code-to-name mapping from a JSON file in the data directory
     
-    try:
-        if os.path.exists(airline_names_file):
-            with open(airline_names_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Remove comment keys
-                _AIRLINE_NAMES = {k: v for k, v in data.items() if not k.startswith('_')}
-                logger.debug(f"Loaded {len(_AIRLINE_NAMES)} airline names from {airline_names_file}")
-        else:
-            logger.warning(f"Airline names file not found: {airline_names_file}, using empty mapping")
-            _AIRLINE_NAMES = {}
-    except Exception as e:
-        logger.warning(f"Error loading airline names from {airline_names_file}: {e}, using empty mapping")
-        _AIRLINE_NAMES = {}
+    Args:
+        filename: File name inside data/ (e.g., 'airline_names.json')
+        description: What the file holds, for log messages (e.g., 'airline names')
     
+    Returns:
+        Mapping without comment keys, or an empty dict if the file is missing or invalid
+    """
+    # Try data/ next to this module first, then relative to project root
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    names_file = os.path.join(current_dir, 'data', filename)
+    fallback_file = os.path.normpath(os.path.join(current_dir, '..', 'data', filename))
+    
+    for path in (names_file, fallback_file):
+        try:
+            if orjson is not None:
+                with open(path, 'rb') as f:
+                    data = orjson.loads(f.read())
+            else:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+        except FileNotFoundError:
+            continue
+        except Exception as e:
+            logger.warning(f"Error loading {description} from {path}: {e}, using empty mapping")
+            return {}
+        
+        # Remove comment keys
+        names = {k: v for k, v in data.items() if not k.startswith('_')}
+        logger.debug(f"Loaded {len(names)} {description} from {path}")
+        return names
+    
+    logger.warning(f"{description.capitalize()} file not found: {fallback_file}, using empty mapping")
+    return {}
+
+
+def _load_airline_names():
+    """Load airline names from external JSON file"""
+    global _AIRLINE_NAMES
+    if _AIRLINE_NAMES is None:
+        _AIRLINE_NAMES = _load_names_file('airline_names.json', 'airline names')
     return _AIRLINE_NAMES
 
 
 def _load_airport_names():
     """Load airport names from external JSON file"""
     global _AIRPORT_NAMES
-    if _AIRPORT_NAMES is not None:
-        return _AIRPORT_NAMES
-    
-    # Try to load from data/airport_names.json
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    airport_names_file = os.path.join(current_dir, 'data', 'airport_names.json')
-    
-    # If not found, try relative to project root
-    if not os.path.exists(airport_names_file):
-        airport_names_file = os.path.join(current_dir, '..', 'data', 'airport_names.json')
-        airport_names_file = os.path.normpath(airport_names_file)
-    
-    try:
-        if os.path.exists(airport_names_file):
-            with open(airport_names_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Remove comment keys
-                _AIRPORT_NAMES = {k: v for k, v in data.items() if not k.startswith('_')}
-                logger.debug(f"Loaded {len(_AIRPORT_NAMES)} airport names from {airport_names_file}")
-        else:
-            logger.warning(f"Airport names file not found: {airport_names_file}, using empty mapping")
-            _AIRPORT_NAMES = {}
-    except Exception as e:
-        logger.warning(f"Error loading airport names from {airport_names_file}: {e}, using empty mapping")
-        _AIRPORT_NAMES = {}
-    
+    if _AIRPORT_NAMES is None:
+        _AIRPORT_NAMES = _load_names_file('airport_names.json', 'airport names')
     return _AIRPORT_NAMES
 
 
@@ -103,10 +219,44 @@ def format_airport_code(code: str) -> str:
     return code
 
 
+def _format_local_datetime(dt: datetime) -> str:
+    """Format a datetime as "YYYY-MM-DD HH:MM" (same as strftime, without its format parsing)"""
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} {dt.hour:02d}:{dt.minute:02d}"
+
+
+def _format_skyscanner_date(date_str: str) -> str:
+    """
+    Format an ISO date or date-time string as DDMMYY for Skyscanner URLs
+    
+    The date is sliced straight out of the string; anything that doesn't look
+    like an ISO date is parsed with datetime (and raises if invalid).
+    
+    Args:
+        date_str: Date in ISO format (e.g., '2025-11-20T17:25:00' or '2025-11-20')
+    
+    Returns:
+        Date as DDMMYY (e.g., '201125')
+    """
+    match = _ISO_DATE_RE.match(date_str)
+    if match:
+        _, year, month, day = match.groups()
+        return f"{day}{month}{year}"
+    
+    # Extract date from ISO format string (handle both with and without time)
+    if 'T' in date_str:
+        date = datetime.fromisoformat(date_str)
+    else:
+        date = datetime.strptime(date_str, "%Y-%m-%d")
+    return date.strftime("%d%m%y")
+
+
+@lru_cache(maxsize=1024)
 def format_airline_codes(codes_str: str) -> str:
     """
     Format airline codes to include names
     
+    Results are cached - the same few carrier combinations repeat across offers.
+    
     Args:
         codes_str: Comma-separated airline codes (e.g., "LX, OS" or "LXOS")
     
@@ -118,42 +268,48 @@ def format_airline_codes(codes_str: str) -> str:
     
     airline_names = _load_airline_names()
     
+    # Normalize case once for the whole string, then strip each code as it is split off
+    codes_str_upper = codes_str.upper()
+    
     # Handle concatenated codes like "LXOS" - split into individual 2-letter codes
     # First try to split by comma, then try to split concatenated codes
-    if ',' in codes_str:
-        codes = [c.strip() for c in codes_str.split(',') if c.strip()]
+    if ',' in codes_str_upper:
+        codes = [c.strip() for c in codes_str_upper.split(',')]
     else:
         # Try to split concatenated codes (e.g., "LXOS" -> ["LX", "OS"])
         # IATA codes are typically 2 letters, so split every 2 characters
-        codes = []
-        code_str_clean = codes_str.strip().upper()
-        i = 0
-        while i < len(code_str_clean):
-            if i + 2 <= len(code_str_clean):
-                codes.append(code_str_clean[i:i+2])
-                i += 2
-            else:
-                # If odd number of characters, take the rest
-                codes.append(code_str_clean[i:])
-                break
+        # (an odd trailing character is kept as its own code)
+        code_str_clean = codes_str_upper.strip()
+        codes = [code_str_clean[i:i + 2].strip() for i in range(0, len(code_str_clean), 2)]
     
     formatted = []
     for code in codes:
-        code_upper = code.upper().strip()
-        if not code_upper:
+        if not code:
             continue
         
         # Check if it's a known airline code
-        airline_name = airline_names.get(code_upper)
+        airline_name = airline_names.get(code)
         if airline_name:
-            formatted.append(f"{code_upper} ({airline_name})")
+            formatted.append(f"{code} ({airline_name})")
         else:
             # If not found, just show the code
-            formatted.append(code_upper)
+            formatted.append(code)
     
     return ", ".join(formatted)
 
 
+# Labels for the usual stop counts, looked up instead of formatted for every flight
+_STOPS_LABELS = {0: "No stops", 1: "1 stop", **{n: f"{n} stops" for n in range(2, 10)}}
+
+
+def _format_stops(stops: int) -> str:
+    """Format a stop count as "No stops", "1 stop", "2 stops", etc."""
+    label = _STOPS_LABELS.get(stops)
+    if label is None:
+        return f"{stops} stops"
+    return label
+
+
 class OutputFormatter:
     """Formats and outputs flight search results"""
     
@@ -192,26 +348,18 @@ class OutputFormatter:
         p2_return_stops = p2_info.get('return_stops', 0)
         
         # Format stops as "No stops", "1 stop", "2 stops", etc.
-        def format_stops(stops: int) -> str:
-            if stops == 0:
-                return "No stops"
-            elif stops == 1:
-                return "1 stop"
-            else:
-                return f"{stops} stops"
-        
-        p1_outbound_stops_str = format_stops(p1_outbound_stops)
-        p1_return_stops_str = format_stops(p1_return_stops)
-        p2_outbound_stops_str = format_stops(p2_outbound_stops)
-        p2_return_stops_str = format_stops(p2_return_stops)
-        
-        # Build description
-        description = f"Both people meet in {dest}. "
-        description += f"Person 1 ({p1_origin}): {p1_outbound_duration} outbound ({p1_outbound_stops_str}), {p1_return_duration} return ({p1_return_stops_str}) - {p1_price:.2f} {currency}. "
-        description += f"Person 2 ({p2_origin}): {p2_outbound_duration} outbound ({p2_outbound_stops_str}), {p2_return_duration} return ({p2_return_stops_str}) - {p2_price:.2f} {currency}. "
-        description += f"Total: {total_price:.2f} {currency}."
-        
-        return description
+        p1_outbound_stops_str = _format_stops(p1_outbound_stops)
+        p1_return_stops_str = _format_stops(p1_return_stops)
+        p2_outbound_stops_str = _format_stops(p2_outbound_stops)
+        p2_return_stops_str = _format_stops(p2_return_stops)
+        
+        # Build description (one f-string, so the sentence is assembled in a single step)
+        return (
+            f"Both people meet in {dest}. "
+            f"Person 1 ({p1_origin}): {p1_outbound_duration} outbound ({p1_outbound_stops_str}), {p1_return_duration} return ({p1_return_stops_str}) - {p1_price:.2f} {currency}. "
+            f"Person 2 ({p2_origin}): {p2_outbound_duration} outbound ({p2_outbound_stops_str}), {p2_return_duration} return ({p2_return_stops_str}) - {p2_price:.2f} {currency}. "
+            f"Total: {total_price:.2f} {currency}."
+        )
     
     @staticmethod
     def create_google_flights_url(origin: str, destination: str, departure_date_str: str, return_date_str: Optional[str] = None, prefer_direct: bool = True) -> str:
@@ -234,7 +382,7 @@ class OutputFormatter:
             
             # Extract date from ISO format string (handle both with and without time)
             if 'T' in departure_date_str:
-                dep_date = datetime.fromisoformat(departure_date_str.replace('Z', '+00:00'))
+                dep_date = datetime.fromisoformat(departure_date_str)
             else:
                 dep_date = datetime.strptime(departure_date_str, "%Y-%m-%d")
             
@@ -251,7 +399,7 @@ class OutputFormatter:
             else:
                 # Round-trip flight URL format: /flights?q=Flights from ORIGIN to DEST on DEP_DATE returning RET_DATE
                 if 'T' in return_date_str:
-                    ret_date = datetime.fromisoformat(return_date_str.replace('Z', '+00:00'))
+                    ret_date = datetime.fromisoformat(return_date_str)
                 else:
                     ret_date = datetime.strptime(return_date_str, "%Y-%m-%d")
                 
@@ -282,14 +430,8 @@ class OutputFormatter:
             # Check if return_date is provided and valid
             is_one_way = not return_date_str or return_date_str == 'N/A' or return_date_str == ''
             
-            # Extract date from ISO format string (handle both with and without time)
-            if 'T' in departure_date_str:
-                dep_date = datetime.fromisoformat(departure_date_str.replace('Z', '+00:00'))
-            else:
-                dep_date = datetime.strptime(departure_date_str, "%Y-%m-%d")
-            
             # Format dates as DDMMYY (e.g., 251120 for 20 Nov 2025)
-            dep_date_str = dep_date.strftime("%d%m%y")
+            dep_date_str = _format_skyscanner_date(departure_date_str)
             
             # Convert airport codes to lowercase
             origin_lower = origin.lower()
@@ -308,12 +450,7 @@ class OutputFormatter:
                 }
             else:
                 # Round-trip flight URL format: /origin/dest/departure_date/return_date/
-                if 'T' in return_date_str:
-                    ret_date = datetime.fromisoformat(return_date_str.replace('Z', '+00:00'))
-                else:
-                    ret_date = datetime.strptime(return_date_str, "%Y-%m-%d")
-                
-                ret_date_str = ret_date.strftime("%d%m%y")
+                ret_date_str = _format_skyscanner_date(return_date_str)
                 url = f"{base_url}/{origin_lower}/{dest_lower}/{dep_date_str}/{ret_date_str}/"
                 params = {
                     'adultsv2': '1',
@@ -366,39 +503,31 @@ class OutputFormatter:
         """
         if not duration_str or not isinstance(duration_str, str):
             return duration_str
-        
-        try:
-            # Remove 'PT' prefix if present
-            duration = duration_str.replace('PT', '')
-            
-            hours = 0
-            minutes = 0
-            
-            # Extract hours
-            if 'H' in duration:
-                hours_str = duration.split('H')[0]
-                hours = int(hours_str)
-                duration = duration.split('H', 1)[1]
-            
-            # Extract minutes
-            if 'M' in duration:
-                minutes_str = duration.split('M')[0]
-                minutes = int(minutes_str)
-            
-            # Format as human-readable
-            parts = []
-            if hours > 0:
-                parts.append(f"{hours}h")
-            if minutes > 0:
-                parts.append(f"{minutes}m")
-            
-            if not parts:
-                return "0m"
-            
-            return " ".join(parts)
-        except Exception as e:
-            logger.debug(f"Error formatting duration '{duration_str}': {e}")
+        return OutputFormatter._format_iso_duration(duration_str)
+    
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def _format_iso_duration(duration_str: str) -> str:
+        """Format a non-empty ISO 8601 duration string (cached - itineraries repeat the same durations)"""
+        match = _DURATION_RE.fullmatch(duration_str)
+        if not match:
+            logger.debug(f"Error formatting duration '{duration_str}': not an hours/minutes duration")
             return duration_str
+        
+        hours = int(match.group(1) or 0)
+        minutes = int(match.group(2) or 0)
+        
+        # Format as human-readable
+        parts = []
+        if hours > 0:
+            parts.append(f"{hours}h")
+        if minutes > 0:
+            parts.append(f"{minutes}m")
+        
+        if not parts:
+            return "0m"
+        
+        return " ".join(parts)
     
     # Airport timezone mapping (IATA code -> timezone name)
     # Common airports and their timezones
@@ -451,20 +580,28 @@ class OutputFormatter:
     }
     
     @staticmethod
-    def get_timezone_for_airport(airport_code: str) -> Optional[pytz.BaseTzInfo]:
+    def get_timezone_for_airport(airport_code: str) -> Optional[ZoneInfo]:
         """
         Get timezone for an airport code automatically using airportsdata library.
         Falls back to hardcoded mapping if library lookup fails.
         
+        Lookups are cached per airport code - every result row repeats the same
+        few airports, and the coordinate lookup in timezonefinder is slow.
+        
         Args:
             airport_code: IATA airport code (e.g., 'TLV', 'ALC')
             
         Returns:
-            pytz timezone object or None if not found
+            ZoneInfo timezone or None if not found
         """
-        airport_code_upper = airport_code.upper()
-        
+        return OutputFormatter._lookup_airport_timezone(airport_code.upper())
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _lookup_airport_timezone(airport_code_upper: str) -> Optional[ZoneInfo]:
+        """Look up the timezone for an upper-case airport code (cached, see get_timezone_for_airport)"""
         # Try automatic detection using airportsdata library + timezonefinder
+        airports, tf = _load_timezone_sources()
         if airports is not None and tf is not None:
             try:
                 airport_info = airports.get(airport_code_upper)
@@ -478,10 +615,10 @@ class OutputFormatter:
                         timezone_name = tf.timezone_at(lat=lat, lng=lon)
                         if timezone_name:
                             try:
-                                tz = pytz.timezone(timezone_name)
+                                tz = ZoneInfo(timezone_name)
                                 logger.debug(f"Auto-detected timezone for {airport_code_upper}: {timezone_name}")
                                 return tz
-                            except pytz.exceptions.UnknownTimeZoneError:
+                            except (ZoneInfoNotFoundError, ValueError):
                                 logger.debug(f"Unknown timezone '{timezone_name}' for {airport_code_upper}, trying fallback")
                         else:
                             logger.debug(f"Could not determine timezone from coordinates for {airport_code_upper}")
@@ -494,10 +631,10 @@ class OutputFormatter:
         timezone_name = OutputFormatter._AIRPORT_TIMEZONES.get(airport_code_upper)
         if timezone_name:
             try:
-                tz = pytz.timezone(timezone_name)
+                tz = ZoneInfo(timezone_name)
                 logger.debug(f"Using fallback timezone for {airport_code_upper}: {timezone_name}")
                 return tz
-            except pytz.exceptions.UnknownTimeZoneError:
+            except (ZoneInfoNotFoundError, ValueError):
                 logger.warning(f"Invalid timezone '{timezone_name}' in fallback mapping for {airport_code_upper}")
                 return None
         
@@ -509,6 +646,9 @@ class OutputFormatter:
         """
         Convert UTC time string to local time for a given airport
         
+        Results are cached per (time, airport) - the CSV export converts eight
+        times per row and flights repeat across many matches.
+        
         Args:
             utc_time_str: UTC time in ISO 8601 format (e.g., "2025-11-20T14:35:00")
             airport_code: IATA airport code
@@ -516,101 +656,117 @@ class OutputFormatter:
         Returns:
             Local time string in format "YYYY-MM-DD HH:MM (Timezone)" or original if conversion fails
         """
-        if not utc_time_str or utc_time_str == 'N/A':
+        if not utc_time_str or utc_time_str == 'N/A' or 'T' not in utc_time_str:
+            return utc_time_str
+        if not isinstance(airport_code, str):
+            # Nothing to look up (the cache needs a hashable code)
             return utc_time_str
         
+        return OutputFormatter._convert_local_time(utc_time_str, airport_code.upper())
+    
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def _convert_local_time(utc_time_str: str, airport_code_upper: str) -> str:
+        """Convert a time for an upper-case airport code (cached, see convert_to_local_time)"""
         try:
             # Parse time (Amadeus API returns times in ISO 8601 format)
-            # Handle both with and without timezone info
-            # Get timezone for airport first (needed for both paths)
-            tz = OutputFormatter.get_timezone_for_airport(airport_code)
-            airport_names = _load_airport_names()
-            airport_name = airport_names.get(airport_code.upper()) if airport_names else None
+            # fromisoformat handles both forms, including a 'Z' suffix, so whether the
+            # time carries timezone info is read from the parsed value
+            dt = datetime.fromisoformat(utc_time_str)
+            tz = OutputFormatter._lookup_airport_timezone(airport_code_upper)
             
-            if 'T' in utc_time_str:
-                # Check if time has timezone info
-                has_timezone = (utc_time_str.endswith('Z') or 
-                               '+' in utc_time_str or 
-                               (len(utc_time_str) > 10 and utc_time_str[-6] in ['+', '-']))
-                
-                if has_timezone:
-                    # Has timezone info (UTC or offset) - treat as UTC and convert to local
-                    dt = datetime.fromisoformat(utc_time_str.replace('Z', '+00:00'))
-                    if tz:
-                        # Convert UTC to local time
-                        local_dt = dt.astimezone(tz)
-                    else:
-                        # No timezone found, return as-is
-                        airport_name = airport_name or airport_code.upper()
-                        return f"{dt.strftime('%Y-%m-%d %H:%M')} ({airport_name})"
-                else:
-                    # No timezone info - Amadeus API returns these as local time for the airport
-                    # Parse as naive datetime and treat as local time (don't convert)
-                    dt = datetime.fromisoformat(utc_time_str)
-                    if tz:
-                        # Localize the naive datetime to the airport's timezone
-                        local_dt = tz.localize(dt)
-                    else:
-                        # No timezone found, return as-is
-                        airport_name = airport_name or airport_code.upper()
-                        return f"{dt.strftime('%Y-%m-%d %H:%M')} ({airport_name})"
-            else:
-                return utc_time_str
+            if not tz:
+                # No timezone found, return as-is with the airport name
+                airport_name = _load_airport_names().get(airport_code_upper)
+                return f"{_format_local_datetime(dt)} ({airport_name or airport_code_upper})"
             
-            if tz:
-                
-                # Try to get airport/city name from airport code first (most reliable)
-                airport_names = _load_airport_names()
-                airport_name = airport_names.get(airport_code.upper())
-                
-                if airport_name:
-                    # Use airport name if available (e.g., "Tel Aviv", "Madrid", "Jerusalem")
-                    timezone_name = airport_name
-                else:
-                    # Fallback to timezone name extraction
-                    timezone_str = str(tz)
-                    # Extract city name from timezone string (e.g., "Asia/Jerusalem" -> "Jerusalem")
-                    if '/' in timezone_str:
-                        timezone_name = timezone_str.split('/')[-1]
-                        # Replace underscores with spaces and capitalize
-                        timezone_name = timezone_name.replace('_', ' ').title()
-                    else:
-                        timezone_name = timezone_str
-                    
-                    # Final fallback to airport code
-                    if not timezone_name or timezone_name == 'UTC':
-                        timezone_name = airport_code.upper()
-                
-                return f"{local_dt.strftime('%Y-%m-%d %H:%M')} ({timezone_name})"
+            if dt.tzinfo is not None:
+                # Has timezone info (UTC or offset) - convert to local time
+                local_dt = dt.astimezone(tz)
             else:
-                # No timezone found, try to use airport name
-                airport_names = _load_airport_names()
-                airport_name = airport_names.get(airport_code.upper(), airport_code.upper())
-                return f"{dt.strftime('%Y-%m-%d %H:%M')} ({airport_name})"
+                # No timezone info - Amadeus API returns these as local time for the airport
+                # (don't convert, just attach the airport's timezone)
+                local_dt = dt.replace(tzinfo=tz)
+            
+            timezone_name = OutputFormatter._timezone_display_name(airport_code_upper, tz)
+            return f"{_format_local_datetime(local_dt)} ({timezone_name})"
         except Exception as e:
             # If conversion fails, return original
             return utc_time_str
     
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _timezone_display_name(airport_code_upper: str, tz: ZoneInfo) -> str:
+        """
+        Get the name shown next to a local time for an airport (cached per airport)
+        
+        Args:
+            airport_code_upper: Upper-case IATA airport code
+            tz: Timezone of the airport
+            
+        Returns:
+            Airport/city name, the city part of the timezone, or the airport code
+        """
+        # Use airport name if available (e.g., "Tel Aviv", "Madrid", "Jerusalem")
+        airport_name = _load_airport_names().get(airport_code_upper)
+        if airport_name:
+            return airport_name
+        
+        # Fallback to timezone name extraction
+        timezone_str = str(tz)
+        # Extract city name from timezone string (e.g., "Asia/Jerusalem" -> "Jerusalem")
+        if '/' in timezone_str:
+            timezone_name = timezone_str.split('/')[-1]
+            # Replace underscores with spaces and capitalize
+            timezone_name = timezone_name.replace('_', ' ').title()
+        else:
+            timezone_name = timezone_str
+        
+        # Final fallback to airport code
+        if not timezone_name or timezone_name == 'UTC':
+            timezone_name = airport_code_upper
+        return timezone_name
+    
     @staticmethod
     def format_flight_info(flight: Dict) -> Dict:
-        """Extract key information from a flight offer"""
+        """
+        Extract key information from a flight offer
+        
+        The same offer is usually formatted many times (it appears in several flight
+        pairs, and in both the console and CSV output), so results are memoized per
+        offer object. The returned dict is shared and must not be modified.
+        """
+        cached = _FLIGHT_INFO_CACHE.get(id(flight))
+        if cached is not None and cached[0] is flight:
+            return cached[1]
+        
+        info = OutputFormatter._extract_flight_info(flight)
+        if len(_FLIGHT_INFO_CACHE) >= _FLIGHT_INFO_CACHE_MAX_SIZE:
+            _FLIGHT_INFO_CACHE.clear()
+        _FLIGHT_INFO_CACHE[id(flight)] = (flight, info)
+        return info
+    
+    @staticmethod
+    def _extract_flight_info(flight: Dict) -> Dict:
+        """Extract key information from a flight offer (uncached)"""
         try:
-            outbound = flight.get('itineraries', [{}])[0]
-            return_trip = flight.get('itineraries', [{}])[1] if len(flight.get('itineraries', [])) > 1 else {}
+            itineraries = flight.get('itineraries', _NO_ITINERARIES)
+            outbound = itineraries[0]
+            return_trip = itineraries[1] if len(itineraries) > 1 else _EMPTY
             
             # Outbound info
-            outbound_segments = outbound.get('segments', [])
-            outbound_dep = outbound_segments[0].get('departure', {}) if outbound_segments else {}
-            outbound_arr = outbound_segments[-1].get('arrival', {}) if outbound_segments else {}
+            outbound_segments = outbound.get('segments', ())
+            outbound_dep = outbound_segments[0].get('departure', _EMPTY) if outbound_segments else _EMPTY
+            outbound_arr = outbound_segments[-1].get('arrival', _EMPTY) if outbound_segments else _EMPTY
             
             # Get origin and destination codes
             origin_code = outbound_dep.get('iataCode', '') if outbound_dep else ''
             destination_code = outbound_arr.get('iataCode', '') if outbound_arr else ''
             
             # Return info
-            return_segments = return_trip.get('segments', [])
-            return_dep = return_segments[0].get('departure', {}) if return_segments else {}
-            return_arr = return_segments[-1].get('arrival', {}) if return_segments else {}
+            return_segments = return_trip.get('segments', ())
+            return_dep = return_segments[0].get('departure', _EMPTY) if return_segments else _EMPTY
+            return_arr = return_segments[-1].get('arrival', _EMPTY) if return_segments else _EMPTY
             
             # Calculate duration
             outbound_duration = outbound.get('duration', '')
@@ -622,9 +778,18 @@ class OutputFormatter:
             outbound_stops = max(0, len(outbound_segments) - 1) if outbound_segments else 0
             return_stops = max(0, len(return_segments) - 1) if return_segments else 0
             
+            # Carrier codes in itinerary order, without duplicates
+            carrier_codes = {}
+            for seg in outbound_segments:
+                carrier_codes[seg.get('carrierCode', '')] = None
+            for seg in return_segments:
+                carrier_codes[seg.get('carrierCode', '')] = None
+            airlines = ', '.join(code for code in carrier_codes if code)
+            
+            price = flight.get('price', _EMPTY)
             return {
-                'price': flight.get('price', {}).get('total', 'N/A'),
-                'currency': flight.get('price', {}).get('currency', 'EUR'),
+                'price': price.get('total', 'N/A'),
+                'currency': price.get('currency', 'EUR'),
                 'origin': origin_code,
                 'destination': destination_code,
                 'route': f"{origin_code} → {destination_code}" if origin_code and destination_code else 'N/A',
@@ -632,264 +797,239 @@ class OutputFormatter:
                 'outbound_arrival': outbound_arr.get('at', 'N/A'),
                 'outbound_duration': outbound_duration,
                 'outbound_stops': outbound_stops,
+                'return_origin': return_dep.get('iataCode', '') if return_dep else '',
+                'return_destination': return_arr.get('iataCode', '') if return_arr else '',
                 'return_departure': return_dep.get('at', 'N/A'),
                 'return_arrival': return_arr.get('at', 'N/A'),
                 'return_duration': return_duration,
                 'return_stops': return_stops,
-                'airlines': ', '.join(set(
-                    seg.get('carrierCode', '') for seg in outbound_segments + return_segments
-                )),
-                'airlines_formatted': format_airline_codes(', '.join(set(
-                    seg.get('carrierCode', '') for seg in outbound_segments + return_segments
-                )))
+                'airlines': airlines,
+                'airlines_formatted': format_airline_codes(airlines)
             }
         except Exception as e:
             return {'error': str(e)}
     
     @staticmethod
     def print_console(results: List[Dict]):
-        """Print results to console"""
+        """
+        Print results to console
+        
+        All lines are collected first and written to stdout at once, instead of
+        one print() call (and stdout lock/flush) per line.
+        """
         if not results:
             print("\n❌ No matching flights found.")
             return
         
-        print(f"\n✅ Found {len(results)} matching flight option(s):\n")
-        print("=" * 100)
+        lines = []
+        lines.append(f"\n✅ Found {len(results)} matching flight option(s):\n")
+        lines.append("=" * 100)
         
         for i, match in enumerate(results, 1):
             dest = match['destination']
-            total_price = match['total_price']
-            p1_price = match['person1_price']
-            p2_price = match['person2_price']
-            
             p1_info = OutputFormatter.format_flight_info(match['person1_flight'])
             p2_info = OutputFormatter.format_flight_info(match['person2_flight'])
             
-            print(f"\n📍 Option {i}: Destination {dest}")
-            print(f"💰 Total Price: {total_price:.2f} {p1_info.get('currency', 'EUR')} "
-                  f"(Person 1: {p1_price:.2f}, Person 2: {p2_price:.2f})")
-            print("-" * 100)
+            lines.append(_CONSOLE_OPTION_TEMPLATE.format_map({
+                'option': i,
+                'destination': dest,
+                'total_price': match['total_price'],
+                'currency': p1_info.get('currency', 'EUR'),
+                'person1_price': match['person1_price'],
+                'person2_price': match['person2_price'],
+            }))
             
-            # Person 1 details
-            p1_origin_code = p1_info.get('origin', 'TLV')
-            print(f"\n👤 Person 1 ({p1_origin_code} → {dest}):")
-            p1_outbound_duration_human = OutputFormatter.format_duration_human(p1_info.get('outbound_duration', ''))
-            p1_return_duration_human = OutputFormatter.format_duration_human(p1_info.get('return_duration', ''))
-            print(f"   Outbound: {p1_info.get('outbound_departure', 'N/A')} → {p1_info.get('outbound_arrival', 'N/A')} "
-                  f"({p1_outbound_duration_human}, {p1_info.get('outbound_stops', 0)} stops)")
-            print(f"   Return:   {p1_info.get('return_departure', 'N/A')} → {p1_info.get('return_arrival', 'N/A')} "
-                  f"({p1_return_duration_human}, {p1_info.get('return_stops', 0)} stops)")
-            print(f"   Airlines: {p1_info.get('airlines_formatted', p1_info.get('airlines', 'N/A'))}")
-            print(f"   Price: {p1_price:.2f} {p1_info.get('currency', 'EUR')}")
+            # Person details
+            lines.append(OutputFormatter._format_console_person(1, p1_info, dest, match['person1_price'], 'TLV'))
+            lines.append(OutputFormatter._format_console_person(2, p2_info, dest, match['person2_price'], 'ALC'))
             
-            # Person 2 details
-            p2_origin_code = p2_info.get('origin', 'ALC')
-            print(f"\n👤 Person 2 ({p2_origin_code} → {dest}):")
-            p2_outbound_duration_human = OutputFormatter.format_duration_human(p2_info.get('outbound_duration', ''))
-            p2_return_duration_human = OutputFormatter.format_duration_human(p2_info.get('return_duration', ''))
-            print(f"   Outbound: {p2_info.get('outbound_departure', 'N/A')} → {p2_info.get('outbound_arrival', 'N/A')} "
-                  f"({p2_outbound_duration_human}, {p2_info.get('outbound_stops', 0)} stops)")
-            print(f"   Return:   {p2_info.get('return_departure', 'N/A')} → {p2_info.get('return_arrival', 'N/A')} "
-                  f"({p2_return_duration_human}, {p2_info.get('return_stops', 0)} stops)")
-            print(f"   Airlines: {p2_info.get('airlines_formatted', p2_info.get('airlines', 'N/A'))}")
-            print(f"   Price: {p2_price:.2f} {p2_info.get('currency', 'EUR')}")
+            lines.append("=" * 100)
+        
+        sys.stdout.write("\n".join(lines) + "\n")
+    
+    @staticmethod
+    def _format_console_person(person: int, info: Dict, destination: str, price: float, default_origin: str) -> str:
+        """
+        Format one person's flight details for console output
+        
+        Args:
+            person: Person number (1 or 2)
+            info: Flight info from format_flight_info()
+            destination: Destination airport code
+            price: Person's flight price
+            default_origin: Origin code shown when the flight info has none
             
-            print("=" * 100)
+        Returns:
+            Multi-line text block for the person
+        """
+        return _CONSOLE_PERSON_TEMPLATE.format_map({
+            'person': person,
+            'origin': info.get('origin', default_origin),
+            'destination': destination,
+            'outbound_departure': info.get('outbound_departure', 'N/A'),
+            'outbound_arrival': info.get('outbound_arrival', 'N/A'),
+            'outbound_duration': OutputFormatter.format_duration_human(info.get('outbound_duration', '')),
+            'outbound_stops': info.get('outbound_stops', 0),
+            'return_departure': info.get('return_departure', 'N/A'),
+            'return_arrival': info.get('return_arrival', 'N/A'),
+            'return_duration': OutputFormatter.format_duration_human(info.get('return_duration', '')),
+            'return_stops': info.get('return_stops', 0),
+            'airlines': info.get('airlines_formatted', 'N/A'),
+            'price': price,
+            'currency': info.get('currency', 'EUR'),
+        })
     
     @staticmethod
-    def export_csv(results: List[Dict], filename: str):
-        """Export results to CSV file with clear route and price information"""
-        if not results:
+    def _csv_info_fields(info: Dict, default_origin: str) -> tuple:
+        """
+        Get the flight info values a CSV row needs, in one itemgetter call
+        
+        Args:
+            info: Flight info from format_flight_info()
+            default_origin: Origin code used when the flight info is an error result
+        
+        Returns:
+            Tuple in _CSV_INFO_FIELDS order (error results get empty defaults)
+        """
+        if 'error' in info:
+            return _CSV_INFO_FIELDS({**_CSV_INFO_DEFAULTS, 'origin': default_origin})
+        return _CSV_INFO_FIELDS(info)
+    
+    @staticmethod
+    def _csv_row(match: Dict) -> tuple:
+        """
+        Build one CSV row for a match
+        
+        Args:
+            match: Match dictionary with both people's flights and prices
+        
+        Returns:
+            Tuple of column values in _CSV_FIELDNAMES order
+        """
+        p1_info = OutputFormatter.format_flight_info(match['person1_flight'])
+        p2_info = OutputFormatter.format_flight_info(match['person2_flight'])
+        
+        dest = match['destination']
+        (p1_origin, p1_return_origin, p1_return_dest,
+         p1_outbound_dep_utc, p1_outbound_arr_utc, p1_return_dep_utc, p1_return_arr_utc,
+         p1_outbound_duration, p1_return_duration, p1_outbound_stops, p1_return_stops,
+         p1_airlines) = OutputFormatter._csv_info_fields(p1_info, 'TLV')
+        (p2_origin, p2_return_origin, p2_return_dest,
+         p2_outbound_dep_utc, p2_outbound_arr_utc, p2_return_dep_utc, p2_return_arr_utc,
+         p2_outbound_duration, p2_return_duration, p2_outbound_stops, p2_return_stops,
+         p2_airlines) = OutputFormatter._csv_info_fields(p2_info, 'ALC')
+        
+        # Return routes come from the same single pass over the itineraries
+        # (e.g. return flights can depart from an airport near the destination)
+        p1_return_origin = p1_return_origin or dest
+        p1_return_dest = p1_return_dest or p1_origin
+        p2_return_origin = p2_return_origin or dest
+        p2_return_dest = p2_return_dest or p2_origin
+        
+        # Main route: both people going to same destination
+        main_route = f"{p1_origin} & {p2_origin} → {dest}"
+        
+        # Convert times to local timezones
+        # Person 1: TLV (Tel Aviv) timezone
+        p1_outbound_dep_local = OutputFormatter.convert_to_local_time(p1_outbound_dep_utc, p1_origin)
+        p1_outbound_arr_local = OutputFormatter.convert_to_local_time(p1_outbound_arr_utc, dest)
+        p1_return_dep_local = OutputFormatter.convert_to_local_time(p1_return_dep_utc, dest)
+        p1_return_arr_local = OutputFormatter.convert_to_local_time(p1_return_arr_utc, p1_origin)
+        
+        # Person 2: ALC (Alicante) timezone
+        p2_outbound_dep_local = OutputFormatter.convert_to_local_time(p2_outbound_dep_utc, p2_origin)
+        p2_outbound_arr_local = OutputFormatter.convert_to_local_time(p2_outbound_arr_utc, dest)
+        p2_return_dep_local = OutputFormatter.convert_to_local_time(p2_return_dep_utc, dest)
+        p2_return_arr_local = OutputFormatter.convert_to_local_time(p2_return_arr_utc, p2_origin)
+        
+        # Format durations to human-readable format
+        p1_outbound_duration_human = OutputFormatter.format_duration_human(p1_outbound_duration)
+        p1_return_duration_human = OutputFormatter.format_duration_human(p1_return_duration)
+        p2_outbound_duration_human = OutputFormatter.format_duration_human(p2_outbound_duration)
+        p2_return_duration_human = OutputFormatter.format_duration_human(p2_return_duration)
+        
+        # Format stops as "No stops", "1 stop", "2 stops", etc.
+        p1_outbound_stops_str = _format_stops(p1_outbound_stops)
+        p1_return_stops_str = _format_stops(p1_return_stops)
+        p2_outbound_stops_str = _format_stops(p2_outbound_stops)
+        p2_return_stops_str = _format_stops(p2_return_stops)
+        
+        # Create human-readable description
+        description = OutputFormatter.create_flight_description(match, p1_info, p2_info)
+        
+        return (
+            # First column: Clear route description
+            main_route,
+            # Second column: Human-readable description
+            description,
+            dest,
+            f"{match['total_price']:.2f}",
+            f"{match['person1_price']:.2f}",
+            f"{match['person2_price']:.2f}",
+            p1_info.get('currency', 'EUR'),
+            
+            # Person 1 - with local times (using correct airport timezones)
+            f"{p1_origin} → {dest} (outbound), {p1_return_origin} → {p1_return_dest} (return)",
+            p1_outbound_dep_utc,
+            p1_outbound_dep_local,  # Local time at origin airport
+            p1_outbound_arr_utc,
+            p1_outbound_arr_local,  # Local time at destination airport
+            p1_outbound_duration_human,
+            p1_outbound_stops_str,
+            p1_return_dep_utc,
+            p1_return_dep_local,  # Local time at destination airport
+            p1_return_arr_utc,
+            p1_return_arr_local,  # Local time at origin airport
+            p1_return_duration_human,
+            p1_return_stops_str,
+            p1_airlines,
+            
+            # Person 2 - with local times (using correct airport timezones)
+            f"{p2_origin} → {dest} (outbound), {p2_return_origin} → {p2_return_dest} (return)",
+            p2_outbound_dep_utc,
+            p2_outbound_dep_local,  # Local time at origin airport
+            p2_outbound_arr_utc,
+            p2_outbound_arr_local,  # Local time at destination airport
+            p2_outbound_duration_human,
+            p2_outbound_stops_str,
+            p2_return_dep_utc,
+            p2_return_dep_local,  # Local time at destination airport
+            p2_return_arr_utc,
+            p2_return_arr_local,  # Local time at origin airport
+            p2_return_duration_human,
+            p2_return_stops_str,
+            p2_airlines
+        )
+    
+    @staticmethod
+    def export_csv(results: Iterable[Dict], filename: str):
+        """
+        Export results to CSV file with clear route and price information
+        
+        Rows are built one at a time as the writer consumes them, so results can be
+        any iterable of matches (a list or a generator) and no list of rows is kept.
+        """
+        results = iter(results)
+        first_match = next(results, None)
+        if first_match is None:
             print("No results to export.")
             return
         
         try:
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                # Simplified, clear fieldnames with route and price first
-                fieldnames = [
-                    # First column: Route (From → To) - MOST IMPORTANT
-                    'route',
-                    # Second column: Human-readable description
-                    'description',
-                    'destination',
-                    'total_price_eur',
-                    'price_person1_eur',
-                    'price_person2_eur',
-                    'currency',
-                    
-                    # Person 1 details - with UTC and local times
-                    'person1_route',
-                    'person1_price_eur',
-                    'person1_outbound_departure_utc',
-                    'person1_outbound_departure_local',
-                    'person1_outbound_arrival_utc',
-                    'person1_outbound_arrival_local',
-                    'person1_outbound_duration',
-                    'person1_outbound_stops',
-                    'person1_return_departure_utc',
-                    'person1_return_departure_local',
-                    'person1_return_arrival_utc',
-                    'person1_return_arrival_local',
-                    'person1_return_duration',
-                    'person1_return_stops',
-                    'person1_airlines',
-                    
-                    # Person 2 details - with UTC and local times
-                    'person2_route',
-                    'person2_price_eur',
-                    'person2_outbound_departure_utc',
-                    'person2_outbound_departure_local',
-                    'person2_outbound_arrival_utc',
-                    'person2_outbound_arrival_local',
-                    'person2_outbound_duration',
-                    'person2_outbound_stops',
-                    'person2_return_departure_utc',
-                    'person2_return_departure_local',
-                    'person2_return_arrival_utc',
-                    'person2_return_arrival_local',
-                    'person2_return_duration',
-                    'person2_return_stops',
-                    'person2_airlines'
-                ]
-                
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for i, match in enumerate(results, 1):
-                    p1_info = OutputFormatter.format_flight_info(match['person1_flight'])
-                    p2_info = OutputFormatter.format_flight_info(match['person2_flight'])
-                    
-                    dest = match['destination']
-                    p1_origin = p1_info.get('origin', 'TLV')
-                    p2_origin = p2_info.get('origin', 'ALC')
-                    
-                    # Get return routes from flight segments
-                    p1_return_origin = dest
-                    p1_return_dest = p1_origin
-                    p2_return_origin = dest
-                    p2_return_dest = p2_origin
-                    
-                    try:
-                        p1_return_segments = match['person1_flight'].get('itineraries', [{}])[1].get('segments', [])
-                        if p1_return_segments:
-                            p1_return_origin = p1_return_segments[0].get('departure', {}).get('iataCode', dest)
-                            p1_return_dest = p1_return_segments[-1].get('arrival', {}).get('iataCode', p1_origin)
-                    except:
-                        pass
-                    
-                    try:
-                        p2_return_segments = match['person2_flight'].get('itineraries', [{}])[1].get('segments', [])
-                        if p2_return_segments:
-                            p2_return_origin = p2_return_segments[0].get('departure', {}).get('iataCode', dest)
-                            p2_return_dest = p2_return_segments[-1].get('arrival', {}).get('iataCode', p2_origin)
-                    except:
-                        pass
-                    
-                    # Main route: both people going to same destination
-                    main_route = f"{p1_origin} & {p2_origin} → {dest}"
-                    
-                    # Convert times to local timezones
-                    # Person 1: TLV (Tel Aviv) timezone
-                    p1_outbound_dep_utc = p1_info.get('outbound_departure', '')
-                    p1_outbound_dep_local = OutputFormatter.convert_to_local_time(p1_outbound_dep_utc, p1_origin)
-                    p1_outbound_arr_utc = p1_info.get('outbound_arrival', '')
-                    p1_outbound_arr_local = OutputFormatter.convert_to_local_time(p1_outbound_arr_utc, dest)
-                    p1_return_dep_utc = p1_info.get('return_departure', '')
-                    p1_return_dep_local = OutputFormatter.convert_to_local_time(p1_return_dep_utc, dest)
-                    p1_return_arr_utc = p1_info.get('return_arrival', '')
-                    p1_return_arr_local = OutputFormatter.convert_to_local_time(p1_return_arr_utc, p1_origin)
-                    
-                    # Person 2: ALC (Alicante) timezone
-                    p2_outbound_dep_utc = p2_info.get('outbound_departure', '')
-                    p2_outbound_dep_local = OutputFormatter.convert_to_local_time(p2_outbound_dep_utc, p2_origin)
-                    p2_outbound_arr_utc = p2_info.get('outbound_arrival', '')
-                    p2_outbound_arr_local = OutputFormatter.convert_to_local_time(p2_outbound_arr_utc, dest)
-                    p2_return_dep_utc = p2_info.get('return_departure', '')
-                    p2_return_dep_local = OutputFormatter.convert_to_local_time(p2_return_dep_utc, dest)
-                    p2_return_arr_utc = p2_info.get('return_arrival', '')
-                    p2_return_arr_local = OutputFormatter.convert_to_local_time(p2_return_arr_utc, p2_origin)
-                    
-                    # Format durations to human-readable format
-                    p1_outbound_duration_human = OutputFormatter.format_duration_human(p1_info.get('outbound_duration', ''))
-                    p1_return_duration_human = OutputFormatter.format_duration_human(p1_info.get('return_duration', ''))
-                    p2_outbound_duration_human = OutputFormatter.format_duration_human(p2_info.get('outbound_duration', ''))
-                    p2_return_duration_human = OutputFormatter.format_duration_human(p2_info.get('return_duration', ''))
-                    
-                    # Format stops as "No stops", "1 stop", "2 stops", etc.
-                    def format_stops(stops: int) -> str:
-                        if stops == 0:
-                            return "No stops"
-                        elif stops == 1:
-                            return "1 stop"
-                        else:
-                            return f"{stops} stops"
-                    
-                    p1_outbound_stops = p1_info.get('outbound_stops', 0)
-                    p1_return_stops = p1_info.get('return_stops', 0)
-                    p2_outbound_stops = p2_info.get('outbound_stops', 0)
-                    p2_return_stops = p2_info.get('return_stops', 0)
-                    
-                    p1_outbound_stops_str = format_stops(p1_outbound_stops)
-                    p1_return_stops_str = format_stops(p1_return_stops)
-                    p2_outbound_stops_str = format_stops(p2_outbound_stops)
-                    p2_return_stops_str = format_stops(p2_return_stops)
-                    
-                    # Create human-readable description
-                    description = OutputFormatter.create_flight_description(match, p1_info, p2_info)
-                    
-                    row = {
-                        # First column: Clear route description
-                        'route': main_route,
-                        # Second column: Human-readable description
-                        'description': description,
-                        'destination': dest,
-                        'total_price_eur': f"{match['total_price']:.2f}",
-                        'price_person1_eur': f"{match['person1_price']:.2f}",
-                        'price_person2_eur': f"{match['person2_price']:.2f}",
-                        'currency': p1_info.get('currency', 'EUR'),
-                        
-                        # Person 1 - with local times (using correct airport timezones)
-                        'person1_route': f"{p1_origin} → {dest} (outbound), {p1_return_origin} → {p1_return_dest} (return)",
-                        'person1_price_eur': f"{match['person1_price']:.2f}",
-                        'person1_outbound_departure_utc': p1_outbound_dep_utc,
-                        'person1_outbound_departure_local': p1_outbound_dep_local,  # Local time at origin airport
-                        'person1_outbound_arrival_utc': p1_outbound_arr_utc,
-                        'person1_outbound_arrival_local': p1_outbound_arr_local,  # Local time at destination airport
-                        'person1_outbound_duration': p1_outbound_duration_human,
-                        'person1_outbound_stops': p1_outbound_stops_str,
-                        'person1_return_departure_utc': p1_return_dep_utc,
-                        'person1_return_departure_local': p1_return_dep_local,  # Local time at destination airport
-                        'person1_return_arrival_utc': p1_return_arr_utc,
-                        'person1_return_arrival_local': p1_return_arr_local,  # Local time at origin airport
-                        'person1_return_duration': p1_return_duration_human,
-                        'person1_return_stops': p1_return_stops_str,
-                        'person1_airlines': p1_info.get('airlines_formatted', p1_info.get('airlines', '')),
-                        
-                        # Person 2 - with local times (using correct airport timezones)
-                        'person2_route': f"{p2_origin} → {dest} (outbound), {p2_return_origin} → {p2_return_dest} (return)",
-                        'person2_price_eur': f"{match['person2_price']:.2f}",
-                        'person2_outbound_departure_utc': p2_outbound_dep_utc,
-                        'person2_outbound_departure_local': p2_outbound_dep_local,  # Local time at origin airport
-                        'person2_outbound_arrival_utc': p2_outbound_arr_utc,
-                        'person2_outbound_arrival_local': p2_outbound_arr_local,  # Local time at destination airport
-                        'person2_outbound_duration': p2_outbound_duration_human,
-                        'person2_outbound_stops': p2_outbound_stops_str,
-                        'person2_return_departure_utc': p2_return_dep_utc,
-                        'person2_return_departure_local': p2_return_dep_local,  # Local time at destination airport
-                        'person2_return_arrival_utc': p2_return_arr_utc,
-                        'person2_return_arrival_local': p2_return_arr_local,  # Local time at origin airport
-                        'person2_return_duration': p2_return_duration_human,
-                        'person2_return_stops': p2_return_stops_str,
-                        'person2_airlines': p2_info.get('airlines_formatted', p2_info.get('airlines', ''))
-                    }
-                    
-                    writer.writerow(row)
+            with open(filename, 'w', newline='', encoding='utf-8', buffering=_CSV_WRITE_BUFFER_SIZE) as csvfile:
+                # Rows are plain tuples in _CSV_FIELDNAMES order, written with csv.writer,
+                # instead of one dict per row that DictWriter has to map back to columns
+                csvfile.write(_CSV_HEADER_LINE)
+                writer = csv.writer(csvfile)
+                writer.writerows(
+                    OutputFormatter._csv_row(match)
+                    for match in itertools.chain((first_match,), results)
+                )
             
             print(f"\n✅ Results exported to {filename}")
             
         except Exception as e:
             print(f"❌ Error exporting to CSV: {e}")
-            import traceback
             traceback.print_exc()
     
     @staticmethod
@@ -921,7 +1061,7 @@ class OutputFormatter:
             for dest in destinations_dict:
                 destinations_dict[dest] = sorted(
                     destinations_dict[dest],
-                    key=lambda x: x['total_price']
+                    key=itemgetter('total_price')
                 )[:3]  # Top 3 flights per destination
             
             # Sort destinations by their cheapest flight's total price
@@ -946,7 +1086,6 @@ class OutputFormatter:
             
         except Exception as e:
             print(f"❌ Error exporting to HTML: {e}")
-            import traceback
             traceback.print_exc()
     
     @staticmethod
@@ -980,8 +1119,8 @@ class OutputFormatter:
             if stop_airport and arrival_time_str and departure_time_str:
                 try:
                     # Parse times and calculate layover
-                    arrival_time = datetime.fromisoformat(arrival_time_str.replace('Z', '+00:00'))
-                    departure_time = datetime.fromisoformat(departure_time_str.replace('Z', '+00:00'))
+                    arrival_time = datetime.fromisoformat(arrival_time_str)
+                    departure_time = datetime.fromisoformat(departure_time_str)
                     layover_duration = departure_time - arrival_time
                     
                     # Format layover duration
@@ -1325,22 +1464,14 @@ class OutputFormatter:
         p2_return_duration = OutputFormatter.format_duration_human(p2_info.get('return_duration', ''))
         
         # Format stops
-        def format_stops(stops: int) -> str:
-            if stops == 0:
-                return "No stops"
-            elif stops == 1:
-                return "1 stop"
-            else:
-                return f"{stops} stops"
-        
-        p1_outbound_stops = format_stops(p1_info.get('outbound_stops', 0))
-        p1_return_stops = format_stops(p1_info.get('return_stops', 0))
-        p2_outbound_stops = format_stops(p2_info.get('outbound_stops', 0))
-        p2_return_stops = format_stops(p2_info.get('return_stops', 0))
+        p1_outbound_stops = _format_stops(p1_info.get('outbound_stops', 0))
+        p1_return_stops = _format_stops(p1_info.get('return_stops', 0))
+        p2_outbound_stops = _format_stops(p2_info.get('outbound_stops', 0))
+        p2_return_stops = _format_stops(p2_info.get('return_stops', 0))
         
         # Format airlines
-        p1_airlines = p1_info.get('airlines_formatted', p1_info.get('airlines', ''))
-        p2_airlines = p2_info.get('airlines_formatted', p2_info.get('airlines', ''))
+        p1_airlines = p1_info.get('airlines_formatted', '')
+        p2_airlines = p2_info.get('airlines_formatted', '')
         
         # Detect flight type (one-way or round-trip) by checking number of itineraries
         p1_flight = match['person1_flight']
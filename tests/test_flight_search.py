@@ -6,7 +6,11 @@ import os
 # Add parent directory to path to import modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import csv
+import json
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime, timedelta
 
@@ -17,9 +21,23 @@ except ImportError:
     Client = None
     ResponseError = Exception
 
+import flight_search
 from flight_search import FlightSearch
 from destination_finder import DestinationFinder
 from output_formatter import OutputFormatter
+import main
+
+
+def make_flight_offer(price: str, arrival, origin: str = 'TLV', departure=None, destination: str = 'BCN') -> dict:
+    """Build a minimal direct one-way flight offer for tests"""
+    return {
+        'price': {'total': price, 'currency': 'EUR'},
+        'itineraries': [{'duration': 'PT3H', 'segments': [{
+            'departure': {'iataCode': origin, 'at': departure},
+            'arrival': {'iataCode': destination, 'at': arrival},
+            'carrierCode': 'VY'
+        }]}]
+    }
 
 
 class TestFlightSearch(unittest.TestCase):
@@ -33,6 +51,16 @@ class TestFlightSearch(unittest.TestCase):
             self.flight_search = FlightSearch(self.api_key, self.api_secret)
             self.flight_search.amadeus = Mock()
     
+    def _find_matches(self, flights1, flights2, **kwargs):
+        """Run find_matching_flights TLV/ALC → PAR with searches returning the given flights"""
+        def mock_search_flights(origin, *args, **search_kwargs):
+            return flights1 if origin == 'TLV' else flights2
+        
+        self.flight_search.search_flights = mock_search_flights
+        return self.flight_search.find_matching_flights(
+            origin1='TLV', origin2='ALC', destination='PAR', departure_date='2024-12-15', **kwargs
+        )
+    
     def test_is_direct_flight(self):
         """Test direct flight detection"""
         # Direct flight
@@ -91,27 +119,49 @@ class TestFlightSearch(unittest.TestCase):
         result = self.flight_search._get_outbound_arrival_time(flight)
         self.assertEqual(result, '2024-12-15T14:30:00Z')
     
-    def test_arrivals_match(self):
-        """Test arrival time matching"""
-        flight1 = {
-            'itineraries': [{
-                'segments': [{
-                    'arrival': {'at': '2024-12-15T14:00:00Z'}
-                }]
-            }]
-        }
-        flight2 = {
-            'itineraries': [{
-                'segments': [{
-                    'arrival': {'at': '2024-12-15T15:30:00Z'}  # 1.5 hours difference
-                }]
-            }]
-        }
-        # Should match within 3 hours tolerance
-        self.assertTrue(self.flight_search._arrivals_match(flight1, flight2, 3))
+    def test_find_matching_flights_price_and_time(self):
+        """Test pairing flights by price limit and arrival tolerance"""
+        flights1 = [
+            make_flight_offer('450.00', '2024-12-15T12:00:00'),  # Over max price
+            make_flight_offer('200.00', '2024-12-15T12:00:00'),
+            make_flight_offer('100.00', '2024-12-15T20:00:00'),  # Arrives too late
+        ]
+        flights2 = [
+            make_flight_offer('150.00', '2024-12-15T13:00:00'),
+            make_flight_offer('120.00', '2024-12-15T11:00:00'),
+        ]
+        
+        matches = self._find_matches(
+            flights1, flights2, return_date='2024-12-22', max_price=400, arrival_tolerance_hours=3
+        )
+        
+        self.assertEqual([m['total_price'] for m in matches], [320.0, 350.0])
+        self.assertTrue(all(m['person1_flight'] is flights1[1] for m in matches))
+        self.assertIs(matches[0]['person2_flight'], flights2[1])
+    
+    def test_find_matching_flights_tolerance_edges(self):
+        """Test the arrival tolerance window at its edges and for unmatchable times"""
+        flights1 = [
+            make_flight_offer('110.00', '2024-12-15T12:00:00Z'),
+            make_flight_offer('100.00', '2024-12-15T12:00:00'),  # Naive - only pairs with naive times
+            make_flight_offer('100.00', 'not-a-date'),  # Unparseable - never pairs
+        ]
+        flights2 = [
+            make_flight_offer('110.00', '2024-12-15T17:00:00+02:00'),  # Exactly 3h after 12:00Z
+            make_flight_offer('110.00', '2024-12-15T15:00:01Z'),  # Just outside the window
+            make_flight_offer('120.00', '2024-12-15T09:00:00'),  # Naive, exactly 3h before
+            make_flight_offer('120.00', None),  # Missing time - never pairs
+        ]
+        
+        matches = self._find_matches(flights1, flights2, max_price=400, arrival_tolerance_hours=3)
+        
+        # Both pairs total 220 - equal totals come out in input order, not price order
+        pairs = [(flights1.index(m['person1_flight']), flights2.index(m['person2_flight'])) for m in matches]
+        self.assertEqual(pairs, [(0, 0), (1, 2)])
         
-        # Should not match with 1 hour tolerance
-        self.assertFalse(self.flight_search._arrivals_match(flight1, flight2, 1))
+        # A one-second narrower window drops both edge pairs
+        matches = self._find_matches(flights1, flights2, max_price=400, arrival_tolerance_hours=3 - 1 / 3600)
+        self.assertEqual(matches, [])
     
     def test_filter_by_departure_time(self):
         """Test filtering by departure time (both outbound and return)"""
@@ -206,6 +256,106 @@ class TestFlightSearch(unittest.TestCase):
         # Only first flight should pass (both outbound and return arrive after 12:00)
         self.assertEqual(len(filtered), 1)
         self.assertEqual(filtered[0], flights[0])
+    
+    def test_flight_cache_roundtrip(self):
+        """Test saving and loading cached flight results"""
+        flights = [{'id': '1', 'price': {'total': '199.99', 'currency': 'EUR'}, 'note': 'Zürich'}]
+        search_args = ('TLV', 'PAR', '2024-12-15', '2024-12-22', 0, 0, 0, 0)
+        
+        # Load airport names first so they aren't looked up in the temporary directory
+        flight_search._load_airport_names()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with patch('flight_search.__file__', os.path.join(tmp_dir, 'flight_search.py')):
+                self.flight_search._save_cached_flights(*search_args, flights, flight_type='both')
+                cached = self.flight_search._get_cached_flights(*search_args, flight_type='both')
+                # A different flight type must not hit the same cache entry
+                other = self.flight_search._get_cached_flights(*search_args, flight_type='outbound')
+                # Neither must a search with a departure time filter
+                filtered = self.flight_search._get_cached_flights(
+                    *search_args, flight_type='both', min_departure_time_outbound='14:00'
+                )
+                # Equivalent parameters share the entry
+                normalized = self.flight_search._get_cached_flights(
+                    'tlv', 'par', '2024-12-15', '2024-12-22', 0, 0, 0, 0.0, flight_type='both'
+                )
+                # A fractional radius gets its own entry instead of overwriting this one
+                self.flight_search._save_cached_flights(
+                    'TLV', 'PAR', '2024-12-15', '2024-12-22', 0, 0.5, 0, 0, [], flight_type='both'
+                )
+                after_fractional = self.flight_search._get_cached_flights(*search_args, flight_type='both')
+        
+        self.assertEqual(cached, flights)
+        self.assertIsNone(other)
+        self.assertIsNone(filtered)
+        self.assertEqual(normalized, flights)
+        self.assertEqual(after_fractional, flights)
+    
+    def test_search_flights_memoized(self):
+        """Test that repeated searches with the same arguments reuse earlier results"""
+        flight = {
+            'id': '1',
+            'price': {'total': '120.00', 'currency': 'EUR'},
+            'itineraries': [{'segments': [{'numberOfStops': 0}]}]
+        }
+        self.flight_search.amadeus.shopping.flight_offers_search.get.return_value = Mock(data=[flight])
+        
+        with patch.object(self.flight_search, '_get_cached_flights', return_value=None), \
+                patch.object(self.flight_search, '_save_cached_flights'):
+            first = self.flight_search.search_flights('TLV', 'PAR', '2024-12-15', flight_type='outbound')
+            second = self.flight_search.search_flights('TLV', 'PAR', '2024-12-15', flight_type='outbound')
+            self.assertEqual(self.flight_search.amadeus.shopping.flight_offers_search.get.call_count, 1)
+            self.assertEqual(first, second)
+            
+            # Different arguments are searched again
+            self.flight_search.search_flights('TLV', 'PAR', '2024-12-16', flight_type='outbound')
+            self.assertEqual(self.flight_search.amadeus.shopping.flight_offers_search.get.call_count, 2)
+    
+    def test_search_flights_warns_on_rate_limit(self):
+        """Test that a throttled (HTTP 429) search is logged as a warning, not just debug"""
+        throttled = Mock(status_code=429, result=None, body='', parsed=False)
+        self.flight_search.amadeus.shopping.flight_offers_search.get.side_effect = flight_search.ResponseError(throttled)
+        
+        with patch.object(self.flight_search, '_get_cached_flights', return_value=None), \
+                self.assertLogs('flight_search', level='WARNING') as logs:
+            flights = self.flight_search.search_flights('TLV', 'PAR', '2024-12-15', flight_type='outbound')
+        
+        self.assertEqual(flights, [])
+        self.assertTrue(any('429' in line for line in logs.output))
+    
+    def test_keep_alive_opener_reuses_connection(self):
+        """Test that API calls to the same host share one HTTPS connection"""
+        response = Mock(status=200, will_close=False, msg={'Content-Type': 'application/json'})
+        response.read.return_value = b'{"data": []}'
+        
+        with patch('flight_search.http.client.HTTPSConnection') as mock_connection, \
+                patch('flight_search.urllib.request.getproxies', return_value={}):
+            mock_connection.return_value.getresponse.return_value = response
+            opener = flight_search._KeepAliveOpener()
+            for path in ('/v1/security/oauth2/token', '/v2/shopping/flight-offers?originLocationCode=TLV'):
+                result = opener(flight_search.urllib.request.Request(f"https://test.api.amadeus.com{path}"))
+                self.assertEqual(result.status, 200)
+                self.assertEqual(result.read(), b'{"data": []}')
+        
+        mock_connection.assert_called_once_with('test.api.amadeus.com', timeout=None)
+        self.assertEqual(mock_connection.return_value.request.call_count, 2)
+    
+    def test_keep_alive_opener_reuses_connection_across_threads(self):
+        """Test that a connection opened on one worker thread is reused by the next"""
+        response = Mock(status=200, will_close=False, msg={})
+        response.read.return_value = b'{}'
+        
+        with patch('flight_search.http.client.HTTPSConnection') as mock_connection, \
+                patch('flight_search.urllib.request.getproxies', return_value={}):
+            mock_connection.return_value.getresponse.return_value = response
+            opener = flight_search._KeepAliveOpener()
+            request = flight_search.urllib.request.Request("https://test.api.amadeus.com/v2/shopping/flight-offers")
+            # A new executor per call, as find_matching_flights does for every destination
+            for _ in range(3):
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    executor.submit(opener, request).result()
+        
+        mock_connection.assert_called_once_with('test.api.amadeus.com', timeout=None)
+        self.assertEqual(mock_connection.return_value.request.call_count, 3)
 
 
 class TestDestinationFinder(unittest.TestCase):
@@ -253,6 +403,54 @@ class TestDestinationFinder(unittest.TestCase):
         
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0]['destination'], 'PAR')
+    
+    def test_find_meeting_destinations_parallel(self):
+        """Test that destinations searched in parallel are all collected, even if one fails"""
+        def mock_find_matching_flights(origin1, origin2, destination, departure_date, **kwargs):
+            if destination == 'MAD':
+                raise RuntimeError("API failure")
+            price = {'BCN': 300, 'AMS': 250}[destination]
+            return [{'destination': destination, 'person1_flight': {}, 'person2_flight': {},
+                     'total_price': price, 'person1_price': price / 2, 'person2_price': price / 2}]
+        
+        self.mock_flight_search.find_matching_flights = mock_find_matching_flights
+        finder = DestinationFinder(self.mock_flight_search, max_parallel_destinations=3)
+        
+        results = finder.find_meeting_destinations(
+            origin1="TLV",
+            origin2="ALC",
+            departure_date="2024-12-15",
+            return_date="2024-12-22",
+            destinations_to_check=["BCN", "MAD", "AMS"]
+        )
+        
+        self.assertEqual([r['destination'] for r in results], ['AMS', 'BCN'])
+    
+    def test_find_meeting_destinations_deduplicates_pairs(self):
+        """Test that the same flight pair returned twice is kept once"""
+        def flight(dep, arr):
+            return {'itineraries': [{'segments': [
+                {'departure': {'at': dep}, 'arrival': {'at': arr}, 'carrierCode': 'VY'}
+            ]}]}
+        
+        def mock_find_matching_flights(origin1, origin2, destination, departure_date, **kwargs):
+            match = {'destination': destination,
+                     'person1_flight': flight('2024-12-15T08:00:00', '2024-12-15T12:00:00'),
+                     'person2_flight': flight('2024-12-15T09:00:00', '2024-12-15T11:00:00'),
+                     'total_price': 300, 'person1_price': 200, 'person2_price': 100}
+            return [match, dict(match)]
+        
+        self.mock_flight_search.find_matching_flights = mock_find_matching_flights
+        
+        results = self.destination_finder.find_meeting_destinations(
+            origin1="TLV",
+            origin2="ALC",
+            departure_date="2024-12-15",
+            return_date="2024-12-22",
+            destinations_to_check=["BCN"]
+        )
+        
+        self.assertEqual(len(results), 1)
 
 
 class TestOutputFormatter(unittest.TestCase):
@@ -278,8 +476,8 @@ class TestOutputFormatter(unittest.TestCase):
                     'duration': 'PT2H30M',
                     'segments': [
                         {
-                            'departure': {'at': '2024-12-22T14:00:00Z'},
-                            'arrival': {'at': '2024-12-22T16:30:00Z'},
+                            'departure': {'iataCode': 'ORY', 'at': '2024-12-22T14:00:00Z'},
+                            'arrival': {'iataCode': 'TLV', 'at': '2024-12-22T16:30:00Z'},
                             'numberOfStops': 0,
                             'carrierCode': 'LH'
                         }
@@ -297,6 +495,156 @@ class TestOutputFormatter(unittest.TestCase):
         self.assertEqual(info['outbound_stops'], 0)
         self.assertEqual(info['return_departure'], '2024-12-22T14:00:00Z')
         self.assertEqual(info['return_arrival'], '2024-12-22T16:30:00Z')
+        self.assertEqual(info['return_origin'], 'ORY')
+        self.assertEqual(info['return_destination'], 'TLV')
+    
+    def test_format_flight_info_airlines_ordered(self):
+        """Test that carrier codes are deduplicated in itinerary order"""
+        def segment(carrier):
+            return {'departure': {'at': '2024-12-15T10:00:00'}, 'carrierCode': carrier}
+        
+        flight = {
+            'price': {'total': '300.00', 'currency': 'EUR'},
+            'itineraries': [
+                {'segments': [segment('OS'), segment('LX')]},
+                {'segments': [segment('LX'), segment('OS'), segment('')]}
+            ]
+        }
+        
+        info = OutputFormatter.format_flight_info(flight)
+        
+        self.assertEqual(info['airlines'], 'OS, LX')
+    
+    def test_format_flight_info_memoized_per_offer(self):
+        """Test that formatting is memoized per offer object, not per offer id"""
+        def make_offer(price):
+            return {
+                'id': '1',  # Offer ids repeat across search responses
+                'price': {'total': price, 'currency': 'EUR'},
+                'itineraries': [{'segments': [{'departure': {'at': '2024-12-15T10:00:00'}}]}]
+            }
+        
+        offer1 = make_offer('100.00')
+        offer2 = make_offer('200.00')
+        
+        self.assertIs(OutputFormatter.format_flight_info(offer1), OutputFormatter.format_flight_info(offer1))
+        self.assertEqual(OutputFormatter.format_flight_info(offer2)['price'], '200.00')
+    
+    def test_format_duration_human(self):
+        """Test formatting ISO 8601 durations"""
+        self.assertEqual(OutputFormatter.format_duration_human('PT5H30M'), '5h 30m')
+        self.assertEqual(OutputFormatter.format_duration_human('PT45M'), '45m')
+        self.assertEqual(OutputFormatter.format_duration_human('PT2H'), '2h')
+        self.assertEqual(OutputFormatter.format_duration_human('PT0M'), '0m')
+        self.assertEqual(OutputFormatter.format_duration_human(''), '')
+        self.assertIsNone(OutputFormatter.format_duration_human(None))
+        # Durations with days are not parsed and are returned unchanged
+        self.assertEqual(OutputFormatter.format_duration_human('P1DT2H'), 'P1DT2H')
+    
+    def test_get_timezone_for_airport_cached(self):
+        """Test that airport timezone lookups are cached per upper-case code"""
+        OutputFormatter._lookup_airport_timezone.cache_clear()
+        
+        tz = OutputFormatter.get_timezone_for_airport('bcn')
+        
+        self.assertIs(OutputFormatter.get_timezone_for_airport('BCN'), tz)
+        self.assertEqual(OutputFormatter._lookup_airport_timezone.cache_info().misses, 1)
+    
+    def test_convert_to_local_time(self):
+        """Test local time conversion for naive, UTC and invalid times"""
+        OutputFormatter._convert_local_time.cache_clear()
+        
+        # Naive times are already local to the airport
+        local = OutputFormatter.convert_to_local_time('2025-07-01T10:00:00', 'BCN')
+        self.assertTrue(local.startswith('2025-07-01 10:00 ('))
+        # UTC times are converted (Barcelona is UTC+2 in summer)
+        self.assertTrue(OutputFormatter.convert_to_local_time('2025-07-01T10:00:00Z', 'bcn').startswith('2025-07-01 12:00 ('))
+        self.assertEqual(OutputFormatter.convert_to_local_time('N/A', 'BCN'), 'N/A')
+        self.assertEqual(OutputFormatter.convert_to_local_time('2025-07-01Tbad', 'BCN'), '2025-07-01Tbad')
+        
+        self.assertEqual(OutputFormatter.convert_to_local_time('2025-07-01T10:00:00', 'bcn'), local)
+        self.assertEqual(OutputFormatter._convert_local_time.cache_info().hits, 1)
+    
+    def test_export_csv_from_generator(self):
+        """Test that CSV export accepts a generator of matches"""
+        matches = ({
+            'destination': 'BCN',
+            'person1_flight': make_flight_offer('100.00', '2024-12-15T11:00:00', 'TLV', '2024-12-15T08:00:00'),
+            'person2_flight': make_flight_offer('100.00', '2024-12-15T10:00:00', 'ALC', '2024-12-15T09:00:00'),
+            'total_price': price * 2, 'person1_price': price, 'person2_price': price
+        } for price in (100.0, 150.0))
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, 'results.csv')
+            OutputFormatter.export_csv(matches, filename)
+            with open(filename, encoding='utf-8') as f:
+                rows = list(csv.reader(f))
+        
+        self.assertEqual(rows[0][:3], ['route', 'description', 'destination'])
+        self.assertEqual([row[3] for row in rows[1:]], ['200.00', '300.00'])
+        self.assertEqual(rows[1][0], 'TLV & ALC → BCN')
+        # Each person's price is exported once
+        self.assertEqual(rows[0].count('price_person1_eur'), 1)
+        self.assertNotIn('person1_price_eur', rows[0])
+
+
+class TestConfig(unittest.TestCase):
+    """Test loading and validating the configuration file"""
+    
+    def setUp(self):
+        """Set up a minimal valid configuration"""
+        self.config = {
+            'origins': {'person1': 'TLV', 'person2': 'ALC'},
+            'search': {'outbound_date': '2025-11-20', 'max_price': 600, 'use_dynamic_destinations': True},
+            'api': {'amadeus_api_key': 'key', 'amadeus_api_secret': 'secret'},
+        }
+    
+    def test_load_toml_config(self):
+        """Test loading config.toml"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config_path = os.path.join(tmp_dir, 'config.toml')
+            with open(config_path, 'w') as f:
+                f.write(
+                    '[origins]\nperson1 = "TLV"\nperson2 = "ALC"\n\n'
+                    '[search]\noutbound_date = "2025-11-20"\nmax_price = 600\nuse_dynamic_destinations = true\n\n'
+                    '[api]\namadeus_api_key = "key"\namadeus_api_secret = "secret"\n'
+                )
+            config = main.load_config(config_path)
+        
+        self.assertEqual(config, self.config)
+        self.assertTrue(main.validate_config(config, config_path))
+    
+    def test_load_json_config(self):
+        """Test loading config.json"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config_path = os.path.join(tmp_dir, 'config.json')
+            with open(config_path, 'w') as f:
+                json.dump(self.config, f)
+            config = main.load_config(config_path)
+        
+        self.assertEqual(config, self.config)
+        self.assertTrue(main.validate_config(config, config_path))
+    
+    def test_validate_config_rejects_invalid_values(self):
+        """Test that empty or wrongly typed values fail validation"""
+        self.config['origins']['person2'] = ''
+        self.config['search'] = ['2025-11-20', 600]
+        
+        with self.assertLogs('main', 'ERROR') as logs:
+            self.assertFalse(main.validate_config(self.config, 'config.toml'))
+        
+        self.assertIn('ERROR:main:Invalid configuration key origins.person2: empty', logs.output)
+        self.assertIn('ERROR:main:Invalid configuration key search: must be a mapping', logs.output)
+    
+    def test_validate_config_names_loaded_file(self):
+        """Test that the missing credentials error names the file that was loaded"""
+        self.config['api']['amadeus_api_secret'] = ''
+        
+        with self.assertLogs('main', 'ERROR') as logs:
+            self.assertFalse(main.validate_config(self.config, 'config.json'))
+        
+        self.assertIn('ERROR:main:Amadeus API credentials not set in config.json', logs.output)
+        self.assertFalse(any('config.yaml' in line for line in logs.output))
 
 
 class TestIntegration(unittest.TestCase):